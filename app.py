@@ -1,88 +1,2308 @@
 import os
+import json
+import time
+import random
+import asyncio
 import logging
-import requests
-import uvicorn
-from typing import Optional, Dict, Any, List
+import threading
+import functools
+import codecs
+import contextlib
+import email.utils
+import hmac
+import hashlib
+import sqlite3
+import contextvars
+import typing
+import tempfile
+
+# Worker processes (see serve_workers) write their metrics to files in
+# PROMETHEUS_MULTIPROC_DIR so /metrics can add them up. prometheus_client
+# picks multiprocess mode when it is imported, so the directory is set first.
+CALCOM_METRICS_DIR_CREATED = False
+if int(os.environ.get("CALCOM_WORKERS", 1)) > 1 and not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="calcom-mcp-metrics-")
+    CALCOM_METRICS_DIR_CREATED = True
+PROMETHEUS_MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess, CONTENT_TYPE_LATEST
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator, Callable, Generic, TypeVar
 from fastmcp import FastMCP
+from fastmcp.server.dependencies import get_http_headers
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize FastMCP
 mcp = FastMCP("Cal.com MCP")
 
 # Cal.com API configuration
-CALCOM_API_BASE = "https://api.cal.com/v2"
+CALCOM_API_BASE = os.environ.get("CALCOM_API_BASE", "https://api.cal.com/v2").rstrip("/")
 CALCOM_API_KEY = os.environ.get("CALCOM_API_KEY")
 
-def get_headers() -> Dict[str, str]:
-    """Get headers for Cal.com API requests"""
-    if not CALCOM_API_KEY:
+# Multi-tenant configuration
+# A tool call may bring its own Cal.com API key in the API_KEY_HEADER HTTP
+# header (empty disables this); CALCOM_API_KEY is used when it does not.
+# Connection pools, cached responses, rate limit buckets and idempotency keys
+# are kept per API key. MAX_TENANTS bounds how many keys keep a connection pool
+# and rate limit bucket, the least recently used are dropped beyond it.
+CALCOM_API_KEY_HEADER = os.environ.get("CALCOM_API_KEY_HEADER", "X-Cal-Api-Key").lower()
+CALCOM_MAX_TENANTS = int(os.environ.get("CALCOM_MAX_TENANTS", 256))
+
+# API key sent with the tool call being handled, set by instrumented
+request_api_key: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_api_key", default=None)
+
+def current_api_key() -> Optional[str]:
+    """Get the API key for the current tool call: its own key, else CALCOM_API_KEY"""
+    return request_api_key.get() or CALCOM_API_KEY
+
+def header_api_key() -> Optional[str]:
+    """Get the API key sent in the CALCOM_API_KEY_HEADER header of the current MCP HTTP request"""
+    if not CALCOM_API_KEY_HEADER:
+        return None
+    return get_http_headers(include={CALCOM_API_KEY_HEADER}).get(CALCOM_API_KEY_HEADER, "").strip() or None
+
+@functools.lru_cache(maxsize=4096)
+def tenant_id(api_key: Optional[str]) -> str:
+    """Short identifier for an API key, used in cache keys instead of the key itself"""
+    return hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+
+def current_tenant() -> str:
+    """Get the tenant identifier of the current tool call's API key"""
+    return tenant_id(current_api_key())
+
+# JSON backend used to decode Cal.com responses and size results
+# auto picks orjson, then msgspec, then the stdlib json module
+CALCOM_JSON_BACKEND = os.environ.get("CALCOM_JSON_BACKEND", "auto").lower()
+
+def load_json_backend(name: str):
+    """Return (name, loads, dumps) for a JSON backend; loads raises ValueError and dumps returns compact UTF-8 bytes"""
+    if name in ("auto", "orjson"):
+        try:
+            import orjson
+            return "orjson", orjson.loads, lambda obj: orjson.dumps(obj, default=str)
+        except ImportError:
+            if name == "orjson":
+                logger.warning("CALCOM_JSON_BACKEND=orjson but orjson is not installed, falling back")
+    if name in ("auto", "orjson", "msgspec"):
+        try:
+            import msgspec
+            encoder = msgspec.json.Encoder(enc_hook=str)
+
+            def loads(data):
+                try:
+                    return msgspec.json.decode(data)
+                except msgspec.DecodeError as e:
+                    raise ValueError(str(e)) from e
+
+            return "msgspec", loads, encoder.encode
+        except ImportError:
+            if name == "msgspec":
+                logger.warning("CALCOM_JSON_BACKEND=msgspec but msgspec is not installed, falling back")
+    return "stdlib", json.loads, lambda obj: json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+JSON_BACKEND, json_loads, json_dumps = load_json_backend(CALCOM_JSON_BACKEND)
+
+# Typed resource models (requires the optional msgspec package)
+# With CALCOM_TYPED_MODELS enabled, list responses are validated and decoded
+# straight into compact structs, then converted to plain JSON once; the
+# response cache keeps that plain result, so cache hits cost nothing extra.
+# Structs keep only modeled fields, so a request is decoded this way only when
+# the fields it returns are all modeled (see typed_projection); everything
+# else, including fields=['*'] and the bookings mirror, gets the full payload.
+# Large nested fields stay as undecoded raw JSON until the conversion.
+CALCOM_TYPED_MODELS = os.environ.get("CALCOM_TYPED_MODELS", "false").lower() in ("1", "true", "yes")
+
+msgspec = None
+if CALCOM_TYPED_MODELS:
+    try:
+        import msgspec
+    except ImportError:
+        logger.warning("CALCOM_TYPED_MODELS is set but msgspec is not installed, typed models are disabled")
+
+RESOURCE_ITEMS: Dict[str, Any] = {}
+RESOURCE_MODELS: Dict[str, Any] = {}
+typed_stats = {"decoded": 0, "fallbacks": 0}
+
+if msgspec is not None:
+    T = TypeVar("T")
+
+    class Person(msgspec.Struct, omit_defaults=True):
+        id: Optional[int] = None
+        name: Optional[str] = None
+        email: Optional[str] = None
+        timeZone: Optional[str] = None
+        language: Optional[str] = None
+        absent: Optional[bool] = None
+
+    class Booking(msgspec.Struct, omit_defaults=True):
+        id: int
+        uid: Optional[str] = None
+        title: Optional[str] = None
+        description: Optional[str] = None
+        status: Optional[str] = None
+        start: Optional[str] = None
+        end: Optional[str] = None
+        duration: Optional[int] = None
+        eventTypeId: Optional[int] = None
+        meetingUrl: Optional[str] = None
+        location: Optional[str] = None
+        cancellationReason: Optional[str] = None
+        rescheduledFromUid: Optional[str] = None
+        hosts: List[Person] = []
+        attendees: List[Person] = []
+        createdAt: Optional[str] = None
+        updatedAt: Optional[str] = None
+        eventType: msgspec.Raw = msgspec.Raw()
+        bookingFieldsResponses: msgspec.Raw = msgspec.Raw()
+        metadata: msgspec.Raw = msgspec.Raw()
+
+    class EventType(msgspec.Struct, omit_defaults=True):
+        id: int
+        title: Optional[str] = None
+        slug: Optional[str] = None
+        description: Optional[str] = None
+        lengthInMinutes: Optional[int] = None
+        length: Optional[int] = None
+        hidden: Optional[bool] = None
+        ownerId: Optional[int] = None
+        scheduleId: Optional[int] = None
+        locations: msgspec.Raw = msgspec.Raw()
+        bookingFields: msgspec.Raw = msgspec.Raw()
+        metadata: msgspec.Raw = msgspec.Raw()
+
+    class Schedule(msgspec.Struct, omit_defaults=True):
+        id: int
+        ownerId: Optional[int] = None
+        name: Optional[str] = None
+        timeZone: Optional[str] = None
+        isDefault: Optional[bool] = None
+        availability: msgspec.Raw = msgspec.Raw()
+        overrides: msgspec.Raw = msgspec.Raw()
+
+    class User(msgspec.Struct, omit_defaults=True):
+        id: int
+        email: Optional[str] = None
+        name: Optional[str] = None
+        username: Optional[str] = None
+        timeZone: Optional[str] = None
+        weekStart: Optional[str] = None
+        defaultScheduleId: Optional[int] = None
+        metadata: msgspec.Raw = msgspec.Raw()
+
+    class Team(msgspec.Struct, omit_defaults=True):
+        id: int
+        name: Optional[str] = None
+        slug: Optional[str] = None
+        parentId: Optional[int] = None
+        isPrivate: Optional[bool] = None
+        metadata: msgspec.Raw = msgspec.Raw()
+
+    class Webhook(msgspec.Struct, omit_defaults=True):
+        id: Any
+        subscriberUrl: Optional[str] = None
+        triggers: List[str] = []
+        active: Optional[bool] = None
+        payloadTemplate: Optional[str] = None
+
+    class Page(msgspec.Struct, Generic[T], omit_defaults=True):
+        data: List[T]
+        status: Optional[str] = None
+        pagination: msgspec.Raw = msgspec.Raw()
+        nextCursor: Optional[Any] = None
+
+    RESOURCE_ITEMS = {
+        "/bookings": Booking,
+        "/event-types": EventType,
+        "/schedules": Schedule,
+        "/users": User,
+        "/teams": Team,
+        "/webhooks": Webhook,
+    }
+    RESOURCE_MODELS = {endpoint: msgspec.json.Decoder(Page[model]) for endpoint, model in RESOURCE_ITEMS.items()}
+
+def model_covers(model: Any, tree: Dict[str, Any]) -> bool:
+    """Whether a typed model keeps every path of a projection tree (raw JSON fields keep everything below them)"""
+    fields = {field.name: field.type for field in msgspec.structs.fields(model)}
+    for key, subtree in tree.items():
+        if key not in fields:
+            return False
+        kind = fields[key]
+        # List[Person] -> Person
+        if typing.get_origin(kind) is list:
+            kind = typing.get_args(kind)[0]
+        if subtree and isinstance(kind, type) and issubclass(kind, msgspec.Struct) and not model_covers(kind, subtree):
+            return False
+    return True
+
+def typed_projection(endpoint: str, projection: "FieldProjection") -> bool:
+    """Whether a list response can be decoded into typed models without losing any of the projected fields"""
+    model = RESOURCE_ITEMS.get("/" + endpoint.strip("/")) if CALCOM_TYPED_MODELS else None
+    return model is not None and projection.tree is not None and model_covers(model, projection.tree)
+
+def decode_response(endpoint: str, content: bytes) -> Any:
+    """Decode a response body, into typed models for list endpoints when enabled"""
+    decoder = RESOURCE_MODELS.get("/" + endpoint.strip("/")) if CALCOM_TYPED_MODELS else None
+    if decoder is not None:
+        try:
+            value = decoder.decode(content)
+            typed_stats["decoded"] += 1
+            return value
+        except msgspec.ValidationError as e:
+            typed_stats["fallbacks"] += 1
+            logger.warning(f"Response from {endpoint} does not match its model, using plain JSON: {e}")
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+    return json_loads(content)
+
+def to_plain(value: Any) -> Any:
+    """Convert a decoded response (typed or not) to plain JSON types"""
+    if msgspec is not None and isinstance(value, msgspec.Struct):
+        return json_loads(msgspec.json.encode(value))
+    return value
+
+class StreamingPageParser:
+    """
+    Incremental parser for a JSON object whose "data" member is a large array.
+    
+    Feed it the response body chunk by chunk. Each element of the top-level
+    "data" array is passed to on_item as soon as it is complete; all other
+    members are collected into the envelope returned by close(). Memory use
+    scales with the largest item rather than the whole body.
+    """
+
+    WHITESPACE = " \t\n\r"
+    DELIMITERS = WHITESPACE + ",:]}"
+
+    def __init__(self, on_item):
+        self.on_item = on_item
+        self.envelope: Dict[str, Any] = {}
+        self.items = 0
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+        # _comma: a ',' must come before the next member; _member: one was just
+        # read, so a member (not ']' or '}') must follow
+        self._comma = False
+        self._member = False
+
+    def feed(self, chunk: bytes, final: bool = False) -> None:
+        self._buffer = self._buffer[self._pos:] + self._utf8.decode(chunk, final)
+        self._pos = 0
+        while self._step(final):
+            pass
+
+    def close(self) -> Dict[str, Any]:
+        self.feed(b"", final=True)
+        if self._state != "done":
+            raise ValueError("Truncated JSON response")
+        return self.envelope
+
+    def _skip(self) -> Optional[str]:
+        """Skip whitespace and peek at the next character"""
+        buffer, pos = self._buffer, self._pos
+        while pos < len(buffer) and buffer[pos] in self.WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return buffer[pos] if pos < len(buffer) else None
+
+    def _value(self, final: bool) -> Tuple[bool, Any]:
+        """Decode the next complete JSON value, or report that more input is needed"""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError("Invalid JSON response")
+            return False, None
+        # A number cut short by the chunk boundary (e.g. "12" of "12.5") still
+        # decodes, so only accept a value once the character after it has arrived
+        if not final and (end == len(self._buffer) or self._buffer[end] not in self.DELIMITERS):
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _separator(self, char: str) -> bool:
+        """Consume the comma expected between members; returns True if one was consumed"""
+        if not self._comma:
+            return False
+        if char != ",":
+            raise ValueError("Expected ',' in JSON response")
+        self._pos += 1
+        self._comma = False
+        self._member = True
+        return True
+
+    def _close(self, char: str) -> None:
+        """Consume the ']' or '}' ending an array or object"""
+        if self._member:
+            raise ValueError(f"Unexpected '{char}' after ',' in JSON response")
+        self._pos += 1
+
+    def _step(self, final: bool) -> bool:
+        """Advance the state machine; returns False when more input is needed"""
+        if self._state == "start":
+            char = self._skip()
+            if char is None:
+                return False
+            if char != "{":
+                raise ValueError("Expected a JSON object")
+            self._pos += 1
+            self._state = "key"
+        elif self._state == "key":
+            char = self._skip()
+            if char is None:
+                return False
+            if char == "}":
+                self._close(char)
+                self._state = "done"
+                return True
+            if self._separator(char):
+                return True
+            start = self._pos
+            complete, key = self._value(final)
+            if not complete:
+                return False
+            if not isinstance(key, str):
+                raise ValueError("Expected a string key in JSON object")
+            char = self._skip()
+            if char is None:
+                # Re-read the key once the colon has arrived
+                self._pos = start
+                return False
+            if char != ":":
+                raise ValueError("Expected ':' in JSON object")
+            self._pos += 1
+            self._key = key
+            self._member = False
+            self._state = "value"
+        elif self._state == "value":
+            char = self._skip()
+            if char is None:
+                return False
+            if self._key == "data" and char == "[":
+                self._pos += 1
+                self._state = "items"
+                return True
+            complete, value = self._value(final)
+            if not complete:
+                return False
+            self.envelope[self._key] = value
+            self._state = "key"
+            self._comma = True
+        elif self._state == "items":
+            char = self._skip()
+            if char is None:
+                return False
+            if char == "]":
+                self._close(char)
+                self._state = "key"
+                self._comma = True
+                return True
+            if self._separator(char):
+                return True
+            complete, item = self._value(final)
+            if not complete:
+                return False
+            self.items += 1
+            self._comma = True
+            self._member = False
+            self.on_item(item)
+        elif self._skip() is not None:
+            raise ValueError("Unexpected data after JSON response")
+        else:
+            return False
+        return True
+
+# Prometheus metrics, served at /metrics
+metrics_registry = CollectorRegistry()
+TOOL_CALLS = Counter("calcom_mcp_tool_calls_total", "MCP tool calls", ["tool"], registry=metrics_registry)
+TOOL_ERRORS = Counter("calcom_mcp_tool_errors_total", "MCP tool calls that returned an error", ["tool"], registry=metrics_registry)
+TOOL_LATENCY = Histogram("calcom_mcp_tool_duration_seconds", "MCP tool call latency", ["tool"], registry=metrics_registry)
+TOOL_IN_FLIGHT = Gauge("calcom_mcp_tool_in_flight", "MCP tool calls in progress", ["tool"], registry=metrics_registry, multiprocess_mode="livesum")
+UPSTREAM_LATENCY = Histogram(
+    "calcom_upstream_request_duration_seconds",
+    "Cal.com API request latency",
+    ["method", "endpoint", "status"],
+    registry=metrics_registry
+)
+UPSTREAM_IN_FLIGHT = Gauge("calcom_upstream_requests_in_flight", "Cal.com API requests in progress", registry=metrics_registry, multiprocess_mode="livesum")
+
+# Tracing configuration (requires the optional opentelemetry-sdk package)
+# CALCOM_TRACING: none, otlp (OTLP/HTTP exporter, configured via the standard
+# OTEL_EXPORTER_OTLP_* variables) or file (JSON lines to CALCOM_TRACING_FILE)
+CALCOM_TRACING = os.environ.get("CALCOM_TRACING", "none").lower()
+CALCOM_TRACING_FILE = os.environ.get("CALCOM_TRACING_FILE", "traces.jsonl")
+
+def configure_tracing():
+    """Set up an OpenTelemetry tracer for CALCOM_TRACING, or return None when tracing is off"""
+    if CALCOM_TRACING in ("", "none", "off"):
+        return None
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor, ConsoleSpanExporter
+        provider = TracerProvider(resource=Resource.create({"service.name": "calcom-mcp"}))
+        if CALCOM_TRACING == "file":
+            exporter = ConsoleSpanExporter(
+                out=open(CALCOM_TRACING_FILE, "a"),
+                formatter=lambda span: span.to_json(indent=None) + "\n"
+            )
+            provider.add_span_processor(SimpleSpanProcessor(exporter))
+        else:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    except ImportError as e:
+        logger.warning(f"Tracing disabled, OpenTelemetry is not installed: {e}")
+        return None
+    trace.set_tracer_provider(provider)
+    return trace.get_tracer("calcom-mcp")
+
+tracer = configure_tracing()
+
+def start_span(name: str, client: bool = False, **attributes):
+    """Start a span as a child of the current one; yields None when tracing is off"""
+    if tracer is None:
+        return contextlib.nullcontext()
+    from opentelemetry.trace import SpanKind
+    kind = SpanKind.CLIENT if client else SpanKind.INTERNAL
+    return tracer.start_as_current_span(name, kind=kind, attributes=attributes)
+
+def set_span_error(span, message: str) -> None:
+    """Mark a span as failed"""
+    from opentelemetry.trace import Status, StatusCode
+    span.set_status(Status(StatusCode.ERROR, message))
+
+# Streaming configuration
+# STREAMING_JSON: parse uncached /bookings pages incrementally from the socket
+# so items are projected as they arrive instead of after the whole body is read
+CALCOM_STREAMING_JSON = os.environ.get("CALCOM_STREAMING_JSON", "false").lower() in ("1", "true", "yes")
+CALCOM_STREAM_CHUNK_SIZE = int(os.environ.get("CALCOM_STREAM_CHUNK_SIZE", 64 * 1024))
+
+# Connection pool configuration
+# POOL_CONNECTIONS: number of per-host pools to keep around
+# POOL_MAXSIZE: keep-alive connections retained per host
+# POOL_BLOCK: when true, POOL_MAXSIZE is a hard per-host limit and callers wait for a free connection
+CALCOM_POOL_CONNECTIONS = int(os.environ.get("CALCOM_POOL_CONNECTIONS", 4))
+CALCOM_POOL_MAXSIZE = int(os.environ.get("CALCOM_POOL_MAXSIZE", 20))
+CALCOM_POOL_BLOCK = os.environ.get("CALCOM_POOL_BLOCK", "false").lower() in ("1", "true", "yes")
+CALCOM_POOL_KEEPALIVE_EXPIRY = float(os.environ.get("CALCOM_POOL_KEEPALIVE_EXPIRY", 30))
+CALCOM_REQUEST_TIMEOUT = float(os.environ.get("CALCOM_REQUEST_TIMEOUT", 30))
+
+# HTTP client used for upstream requests
+# async: native asyncio client (httpx), requests never block a worker thread
+# sync: the pooled requests session, run in a worker thread per request
+CALCOM_HTTP_CLIENT = os.environ.get("CALCOM_HTTP_CLIENT", "async").lower()
+
+# The HTTP clients are imported on first use (see get_session and
+# get_async_client) to keep them out of the import-time critical path
+@functools.lru_cache(maxsize=None)
+def http_errors() -> Tuple[type, ...]:
+    """Exception types raised by the configured HTTP client for transport failures"""
+    if CALCOM_HTTP_CLIENT == "sync":
+        import requests
+        return (requests.exceptions.RequestException,)
+    import httpx
+    return (httpx.HTTPError,)
+
+# Per-endpoint request configuration, keyed by "/resource" or "METHOD /resource"
+# (the more specific key wins).
+# api_version: cal-api-version header sent with the request
+# error: error label returned for unsuccessful responses
+# timeout: request timeout in seconds
+# CALCOM_ENDPOINT_CONFIG accepts a JSON object merged over these, e.g.
+# {"/bookings": {"timeout": 60}}
+DEFAULT_ENDPOINT_CONFIG = {"api_version": None, "error": "API request failed", "timeout": CALCOM_REQUEST_TIMEOUT}
+ENDPOINT_CONFIGS = {
+    "/bookings": {"api_version": "2024-08-13"},
+    "POST /bookings": {"error": "Booking creation failed"}
+}
+CALCOM_ENDPOINT_CONFIG = json.loads(os.environ.get("CALCOM_ENDPOINT_CONFIG", "{}"))
+
+@functools.lru_cache(maxsize=None)
+def group_config(method: str, group: str) -> Dict[str, Any]:
+    """Merge the configuration for a method and endpoint group"""
+    config = dict(DEFAULT_ENDPOINT_CONFIG)
+    for key in (group, f"{method} {group}"):
+        config.update(ENDPOINT_CONFIGS.get(key, {}))
+        config.update(CALCOM_ENDPOINT_CONFIG.get(key, {}))
+    return config
+
+def endpoint_config(method: str, endpoint: str) -> Dict[str, Any]:
+    """Get the request configuration for a method and endpoint"""
+    return group_config(method, endpoint_group(endpoint))
+
+class ApiRequest:
+    """A Cal.com API call on its way through the request pipeline"""
+
+    def __init__(self, method: str, endpoint: str, params: Optional[Dict] = None, data: Optional[Dict] = None, transform: Optional[Callable[[Any], Any]] = None, typed: bool = False):
+        self.method = method.upper()
+        self.endpoint = endpoint
+        self.url = f"{CALCOM_API_BASE}/{endpoint.lstrip('/')}"
+        self.params = params
+        self.data = data
+        self.headers: Dict[str, str] = {}
+        self.config = endpoint_config(self.method, endpoint)
+        self.api_key = current_api_key()
+        self.tenant = tenant_id(self.api_key)
+        # Set by the pipeline: item transform applied while streaming, the chunk
+        # callback for a streamed body and the bytes streamed by the last attempt
+        self.transform = transform
+        # Whether the response may be decoded into typed models (see typed_projection)
+        self.typed = typed
+        self.on_chunk: Optional[Callable[[bytes], None]] = None
+        self.streamed = 0
+        # Set by the response cache middleware and the decoder
+        self.stale: Optional["CacheEntry"] = None
+        self.response = None
+        self.decoded: Any = None
+        self._cache_key: Optional[str] = None
+
+    @property
+    def group(self) -> str:
+        return endpoint_group(self.endpoint)
+
+    @property
+    def cache_key(self) -> str:
+        if self._cache_key is None:
+            self._cache_key = ResponseCache.make_key(self.endpoint, self.params, self.tenant)
+            # Typed and full responses are cached separately
+            if self.typed:
+                self._cache_key += "#typed"
+        return self._cache_key
+
+    def send_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for the HTTP client"""
+        kwargs = {"headers": self.headers, "params": self.params, "timeout": self.config["timeout"]}
+        if self.method in ("POST", "PUT"):
+            kwargs["json"] = self.data
+        if self.on_chunk is not None:
+            on_chunk = self.on_chunk
+            self.streamed = 0
+
+            def count_chunk(chunk: bytes) -> None:
+                self.streamed += len(chunk)
+                on_chunk(chunk)
+            kwargs["on_chunk"] = count_chunk
+        return kwargs
+
+# Keep-alive sessions by tenant, least recently used first
+_sessions: "OrderedDict[str, requests.Session]" = OrderedDict()
+_session_lock = threading.Lock()
+_session_requests = 0
+
+def get_session(tenant: str = "") -> "requests.Session":
+    """Get the keep-alive session used for a tenant's Cal.com API requests"""
+    with _session_lock:
+        session = _sessions.get(tenant)
+        if session is not None:
+            _sessions.move_to_end(tenant)
+            return session
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=CALCOM_POOL_CONNECTIONS,
+            pool_maxsize=CALCOM_POOL_MAXSIZE,
+            pool_block=CALCOM_POOL_BLOCK
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _sessions[tenant] = session
+        while len(_sessions) > CALCOM_MAX_TENANTS:
+            # Connections in use are closed when they are returned to the pool
+            _sessions.popitem(last=False)[1].close()
+        return session
+
+def send_request(method: str, url: str, on_chunk=None, tenant: str = "", **kwargs) -> "requests.Response":
+    """Send a request through the tenant's session, streaming a 200 body to on_chunk when given"""
+    global _session_requests
+    _session_requests += 1
+    kwargs.setdefault("timeout", CALCOM_REQUEST_TIMEOUT)
+    if on_chunk is None:
+        return get_session(tenant).request(method, url, **kwargs)
+    response = get_session(tenant).request(method, url, stream=True, **kwargs)
+    try:
+        if response.status_code == 200:
+            for chunk in response.iter_content(CALCOM_STREAM_CHUNK_SIZE):
+                on_chunk(chunk)
+        else:
+            response.content
+    finally:
+        response.close()
+    return response
+
+# asyncio clients by tenant, least recently used first
+_async_clients: "OrderedDict[str, httpx.AsyncClient]" = OrderedDict()
+_closing_clients: set = set()
+_async_client_requests = 0
+
+def get_async_client(tenant: str = "") -> "httpx.AsyncClient":
+    """Get the asyncio client used for a tenant's Cal.com API requests"""
+    client = _async_clients.get(tenant)
+    if client is not None:
+        _async_clients.move_to_end(tenant)
+        return client
+    import httpx
+    client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=CALCOM_POOL_MAXSIZE if CALCOM_POOL_BLOCK else None,
+            max_keepalive_connections=CALCOM_POOL_MAXSIZE,
+            keepalive_expiry=CALCOM_POOL_KEEPALIVE_EXPIRY
+        ),
+        timeout=CALCOM_REQUEST_TIMEOUT
+    )
+    _async_clients[tenant] = client
+    while len(_async_clients) > CALCOM_MAX_TENANTS:
+        close_async_client(_async_clients.popitem(last=False)[1])
+    return client
+
+def close_async_client(client: "httpx.AsyncClient") -> None:
+    """Close an evicted client once requests already using it have had time to finish"""
+
+    def close() -> None:
+        task = asyncio.ensure_future(client.aclose())
+        _closing_clients.add(task)
+        task.add_done_callback(_closing_clients.discard)
+    asyncio.get_running_loop().call_later(CALCOM_REQUEST_TIMEOUT, close)
+
+async def send_request_async(method: str, url: str, on_chunk=None, tenant: str = "", **kwargs) -> "httpx.Response":
+    """Send a request through the tenant's asyncio client, streaming a 200 body to on_chunk when given"""
+    global _async_client_requests
+    _async_client_requests += 1
+    client = get_async_client(tenant)
+    if on_chunk is None:
+        return await client.request(method, url, **kwargs)
+    async with client.stream(method, url, **kwargs) as response:
+        if response.status_code == 200:
+            async for chunk in response.aiter_bytes(CALCOM_STREAM_CHUNK_SIZE):
+                on_chunk(chunk)
+        else:
+            await response.aread()
+    return response
+
+async def transport(request: ApiRequest):
+    """Send a request using the configured HTTP client (CALCOM_HTTP_CLIENT)"""
+    kwargs = request.send_kwargs()
+    if CALCOM_HTTP_CLIENT == "sync":
+        return await asyncio.to_thread(send_request, request.method, request.url, tenant=request.tenant, **kwargs)
+    return await send_request_async(request.method, request.url, tenant=request.tenant, **kwargs)
+
+async def observe(request: ApiRequest, call_next):
+    """Middleware recording upstream latency, in-flight requests and a client span for each attempt"""
+    status = "error"
+    start = time.perf_counter()
+    UPSTREAM_IN_FLIGHT.inc()
+    with start_span(f"{request.method} {request.group}", client=True) as span:
+        if span is not None:
+            span.set_attribute("http.request.method", request.method)
+            span.set_attribute("url.full", request.url)
+            span.set_attribute("calcom.endpoint", request.endpoint)
+            span.set_attribute("calcom.params_size", len(json_dumps(request.params or {})))
+        try:
+            response = await call_next(request)
+            status = str(response.status_code)
+            if span is not None:
+                span.set_attribute("http.response.status_code", response.status_code)
+                # A streamed body has been consumed, so response.content is unavailable
+                span.set_attribute("http.response.body.size", request.streamed if request.on_chunk is not None else len(response.content))
+                if response.status_code >= 400:
+                    set_span_error(span, f"HTTP {response.status_code}")
+            return response
+        finally:
+            UPSTREAM_IN_FLIGHT.dec()
+            UPSTREAM_LATENCY.labels(request.method, request.group, status).observe(time.perf_counter() - start)
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Collect connection pool statistics for the configured HTTP client"""
+    if CALCOM_HTTP_CLIENT != "sync":
+        stats = {
+            "client": "async",
+            "max_keepalive_connections": CALCOM_POOL_MAXSIZE,
+            "keepalive_expiry": CALCOM_POOL_KEEPALIVE_EXPIRY,
+            "requests_sent": _async_client_requests,
+            "tenants": len(_async_clients),
+            "open_connections": 0,
+            "idle_connections": 0
+        }
+        # httpx does not expose pool usage publicly, so read it from the transport when available
+        for client in list(_async_clients.values()):
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+            stats["open_connections"] += len(connections)
+            stats["idle_connections"] += sum(1 for conn in connections if conn.is_idle())
+        return stats
+
+    stats = {
+        "client": "sync",
+        "pool_connections": CALCOM_POOL_CONNECTIONS,
+        "pool_maxsize": CALCOM_POOL_MAXSIZE,
+        "pool_block": CALCOM_POOL_BLOCK,
+        "requests_sent": _session_requests,
+        "tenants": len(_sessions),
+        "hosts": {}
+    }
+    with _session_lock:
+        sessions = list(_sessions.values())
+    for session in sessions:
+        adapter = session.get_adapter(CALCOM_API_BASE)
+        for key in list(adapter.poolmanager.pools.keys()):
+            pool = adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            host = stats["hosts"].setdefault(f"{pool.scheme}://{pool.host}:{pool.port}", {"connections_opened": 0, "requests": 0, "idle_connections": 0})
+            host["connections_opened"] += pool.num_connections
+            host["requests"] += pool.num_requests
+            host["idle_connections"] += sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0
+    return stats
+
+# Rate limiting configuration
+# Requests are queued client-side behind a token bucket per API key. The bucket
+# starts at RATE_LIMIT requests per RATE_LIMIT_WINDOW seconds and is corrected
+# from the X-RateLimit-* / Retry-After headers Cal.com returns.
+# RATE_LIMIT_MAX_WAIT: longest a single request may queue before failing
+# RATE_LIMIT_RETRIES: how many times a 429 response is requeued
+CALCOM_RATE_LIMIT = float(os.environ.get("CALCOM_RATE_LIMIT", 120))
+CALCOM_RATE_LIMIT_WINDOW = float(os.environ.get("CALCOM_RATE_LIMIT_WINDOW", 60))
+CALCOM_RATE_LIMIT_MAX_WAIT = float(os.environ.get("CALCOM_RATE_LIMIT_MAX_WAIT", 60))
+CALCOM_RATE_LIMIT_RETRIES = int(os.environ.get("CALCOM_RATE_LIMIT_RETRIES", 3))
+
+class RateLimitTimeout(Exception):
+    """Raised when a request would have to queue longer than CALCOM_RATE_LIMIT_MAX_WAIT"""
+
+def parse_delay(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After / X-RateLimit-Reset value into seconds from now"""
+    if not value:
+        return None
+    try:
+        number = float(value)
+    except ValueError:
+        try:
+            return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+    # Reset headers are sent either as a delay or as an epoch timestamp (s or ms)
+    if number > 1e12:
+        number = number / 1000 - time.time()
+    elif number > 1e9:
+        number = number - time.time()
+    return max(number, 0.0)
+
+class TokenBucket:
+    """
+    Token bucket for one API key; waiters are served in arrival order.
+    
+    share is the fraction of the Cal.com limit this process may use, so that
+    several worker processes together stay within it.
+    """
+
+    def __init__(self, capacity: float, window: float, share: float = 1.0):
+        self.capacity = capacity * share
+        self.window = window
+        self.share = share
+        self.refill_rate = self.capacity / window
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def refill(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+        return now
+
+    async def acquire(self) -> float:
+        """Wait for a token and return how long the caller waited"""
+        start = time.monotonic()
+        async with self.lock:
+            while True:
+                now = self.refill()
+                delay = self.blocked_until - now
+                if delay <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return now - start
+                    delay = (1 - self.tokens) / self.refill_rate
+                if now - start + delay > CALCOM_RATE_LIMIT_MAX_WAIT:
+                    raise RateLimitTimeout(f"Rate limited by Cal.com for more than {CALCOM_RATE_LIMIT_MAX_WAIT:g}s")
+                await asyncio.sleep(delay)
+
+    def update(self, headers, status_code: int) -> None:
+        """Correct the bucket from the rate limit headers of a response"""
+        now = self.refill()
+        limit = headers.get("X-RateLimit-Limit")
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = parse_delay(headers.get("X-RateLimit-Reset"))
+        retry_after = parse_delay(headers.get("Retry-After"))
+        try:
+            if limit is not None and float(limit) > 0:
+                self.capacity = float(limit) * self.share
+                self.refill_rate = self.capacity / self.window
+            if remaining is not None:
+                self.tokens = min(self.tokens, float(remaining) * self.share)
+        except ValueError:
+            pass
+        if status_code == 429:
+            delay = retry_after if retry_after is not None else reset
+            self.tokens = 0
+            self.blocked_until = now + (delay if delay is not None else 1 / self.refill_rate)
+        elif remaining is not None and self.tokens < 1 and reset is not None:
+            self.blocked_until = now + reset
+
+class RateLimiter:
+    """Per API key token buckets with wait time metrics, keeping the max_buckets most recently used"""
+
+    def __init__(self, capacity: float, window: float, share: float = 1.0, max_buckets: int = CALCOM_MAX_TENANTS):
+        self.capacity = capacity
+        self.window = window
+        self.share = share
+        self.max_buckets = max_buckets
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.requests = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.throttled = 0
+        self.queued = 0
+
+    def bucket(self, api_key: str) -> TokenBucket:
+        if api_key in self.buckets:
+            self.buckets.move_to_end(api_key)
+            return self.buckets[api_key]
+        bucket = self.buckets[api_key] = TokenBucket(self.capacity, self.window, self.share)
+        while len(self.buckets) > self.max_buckets:
+            self.buckets.popitem(last=False)
+        return bucket
+
+    def partition(self, share: float) -> None:
+        """Limit this process to a fraction of the rate limit, starting with fresh buckets"""
+        self.share = share
+        self.buckets.clear()
+
+    async def acquire(self, bucket: TokenBucket) -> None:
+        self.requests += 1
+        self.queued += 1
+        try:
+            waited = await bucket.acquire()
+        finally:
+            self.queued -= 1
+        if waited > 0.001:
+            self.waits += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buckets": len(self.buckets),
+            "share": round(self.share, 3),
+            "requests": self.requests,
+            "queued": self.queued,
+            "waits": self.waits,
+            "wait_seconds_total": round(self.wait_seconds, 3),
+            "wait_seconds_max": round(self.max_wait_seconds, 3),
+            "throttled_responses": self.throttled
+        }
+
+rate_limiter = RateLimiter(CALCOM_RATE_LIMIT, CALCOM_RATE_LIMIT_WINDOW)
+
+async def rate_limit(request: ApiRequest, call_next):
+    """Middleware sending a request once the rate limiter allows it, requeueing 429 responses"""
+    bucket = rate_limiter.bucket(request.tenant)
+    for attempt in range(CALCOM_RATE_LIMIT_RETRIES + 1):
+        await rate_limiter.acquire(bucket)
+        response = await call_next(request)
+        bucket.update(response.headers, response.status_code)
+        if response.status_code != 429:
+            break
+        rate_limiter.throttled += 1
+    return response
+
+# Circuit breaker configuration
+# Each API key has its own breaker per endpoint group (/bookings,
+# /event-types, ...), so one tenant's failing requests do not pause others.
+# BREAKER_FAILURES consecutive failures (connection errors or 5xx) open it and
+# requests fail fast; after BREAKER_RESET_TIMEOUT seconds one trial request is
+# let through (half-open) and its outcome closes or re-opens the breaker.
+CALCOM_BREAKER_FAILURES = int(os.environ.get("CALCOM_BREAKER_FAILURES", 5))
+CALCOM_BREAKER_RESET_TIMEOUT = float(os.environ.get("CALCOM_BREAKER_RESET_TIMEOUT", 30))
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit breaker is open"""
+
+    def __init__(self, group: str, retry_after: float):
+        super().__init__(f"Cal.com {group} is failing, requests are paused for {retry_after:.1f}s")
+        self.group = group
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one endpoint group"""
+
+    def __init__(self, group: str, failure_threshold: int, reset_timeout: float):
+        self.group = group
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    def allow(self) -> None:
+        """Raise CircuitOpenError unless a request may be sent now"""
+        if self.state == "open":
+            retry_after = self.opened_at + self.reset_timeout - time.monotonic()
+            if retry_after > 0:
+                self.rejected += 1
+                raise CircuitOpenError(self.group, retry_after)
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self.trial_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(self.group, 0)
+            self.trial_in_flight = True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+                logger.warning(f"Circuit breaker for {self.group} opened after {self.failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Give back a half-open trial slot when the request ended without an outcome"""
+        self.trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
+
+class CircuitBreakers:
+    """Registry of circuit breakers keyed by tenant and endpoint group, keeping the max_tenants most recently used tenants"""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, max_tenants: int = CALCOM_MAX_TENANTS):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_tenants = max_tenants
+        self.breakers: "OrderedDict[str, Dict[str, CircuitBreaker]]" = OrderedDict()
+
+    def get(self, tenant: str, group: str) -> CircuitBreaker:
+        breakers = self.breakers.get(tenant)
+        if breakers is None:
+            breakers = self.breakers[tenant] = {}
+            while len(self.breakers) > self.max_tenants:
+                self.breakers.popitem(last=False)
+        self.breakers.move_to_end(tenant)
+        if group not in breakers:
+            breakers[group] = CircuitBreaker(group, self.failure_threshold, self.reset_timeout)
+        return breakers[group]
+
+    def stats(self, tenant: str) -> Dict[str, Any]:
+        """Report one tenant's breakers"""
+        return {group: breaker.stats() for group, breaker in self.breakers.get(tenant, {}).items()}
+
+circuit_breakers = CircuitBreakers(CALCOM_BREAKER_FAILURES, CALCOM_BREAKER_RESET_TIMEOUT)
+
+# Retry configuration
+# Failed requests are retried with full-jitter exponential backoff. Only
+# idempotent methods are retried by default. Every request deposits
+# RETRY_BUDGET_RATIO into its API key's budget (capped at RETRY_BUDGET_RESERVE)
+# and every retry spends one, so a degraded upstream cannot trigger a retry
+# storm and one tenant cannot spend the retries of others.
+CALCOM_RETRY_ATTEMPTS = int(os.environ.get("CALCOM_RETRY_ATTEMPTS", 3))
+CALCOM_RETRY_BACKOFF_BASE = float(os.environ.get("CALCOM_RETRY_BACKOFF_BASE", 0.2))
+CALCOM_RETRY_BACKOFF_MAX = float(os.environ.get("CALCOM_RETRY_BACKOFF_MAX", 5))
+CALCOM_RETRY_METHODS = os.environ.get("CALCOM_RETRY_METHODS", "GET,HEAD,OPTIONS,PUT,DELETE")
+CALCOM_RETRY_STATUSES = os.environ.get("CALCOM_RETRY_STATUSES", "500,502,503,504")
+CALCOM_RETRY_BUDGET_RATIO = float(os.environ.get("CALCOM_RETRY_BUDGET_RATIO", 0.2))
+CALCOM_RETRY_BUDGET_RESERVE = float(os.environ.get("CALCOM_RETRY_BUDGET_RESERVE", 10))
+
+class RetryPolicy:
+    """Decides whether and when to retry a failed upstream request"""
+
+    def __init__(self, attempts: int, backoff_base: float, backoff_max: float, methods: str, statuses: str, budget_ratio: float, budget_reserve: float, max_tenants: int = CALCOM_MAX_TENANTS):
+        self.attempts = attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.methods = {m.strip().upper() for m in methods.split(",") if m.strip()}
+        self.statuses = {int(code) for code in statuses.split(",") if code.strip()}
+        self.budget_ratio = budget_ratio
+        self.budget_reserve = budget_reserve
+        self.max_tenants = max_tenants
+        # Retry budget by tenant, least recently used first
+        self.budgets: "OrderedDict[str, float]" = OrderedDict()
+        self.retries = 0
+        self.retries_denied = 0
+
+    def budget(self, tenant: str) -> float:
+        return self.budgets.get(tenant, self.budget_reserve)
+
+    def record_request(self, tenant: str = "") -> None:
+        self.budgets[tenant] = min(self.budget_reserve, self.budget(tenant) + self.budget_ratio)
+        self.budgets.move_to_end(tenant)
+        while len(self.budgets) > self.max_tenants:
+            self.budgets.popitem(last=False)
+
+    def should_retry(self, method: str, attempt: int, status_code: Optional[int] = None, tenant: str = "") -> bool:
+        """Check a failed attempt (status_code is None for connection errors) against the policy and the tenant's budget"""
+        if attempt >= self.attempts or method.upper() not in self.methods:
+            return False
+        if status_code is not None and status_code not in self.statuses:
+            return False
+        if self.budget(tenant) < 1:
+            self.retries_denied += 1
+            return False
+        self.budgets[tenant] = self.budget(tenant) - 1
+        self.retries += 1
+        return True
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def stats(self, tenant: str) -> Dict[str, Any]:
+        """Report retry counts and one tenant's remaining budget"""
+        return {
+            "retries": self.retries,
+            "retries_denied_by_budget": self.retries_denied,
+            "budget_remaining": round(self.budget(tenant), 2)
+        }
+
+retry_policy = RetryPolicy(
+    CALCOM_RETRY_ATTEMPTS,
+    CALCOM_RETRY_BACKOFF_BASE,
+    CALCOM_RETRY_BACKOFF_MAX,
+    CALCOM_RETRY_METHODS,
+    CALCOM_RETRY_STATUSES,
+    CALCOM_RETRY_BUDGET_RATIO,
+    CALCOM_RETRY_BUDGET_RESERVE
+)
+
+async def retry(request: ApiRequest, call_next):
+    """Middleware passing a request through its circuit breaker, retrying transient failures according to retry_policy"""
+    breaker = circuit_breakers.get(request.tenant, request.group)
+    retry_policy.record_request(request.tenant)
+    attempt = 0
+    while True:
+        breaker.allow()
+        try:
+            response = await call_next(request)
+        except http_errors():
+            breaker.record_failure()
+            # A streamed body may already have been partly delivered, so it is not retried
+            if request.on_chunk is not None or not retry_policy.should_retry(request.method, attempt, tenant=request.tenant):
+                raise
+        except BaseException:
+            breaker.release()
+            raise
+        else:
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if not retry_policy.should_retry(request.method, attempt, response.status_code, request.tenant):
+                return response
+        await asyncio.sleep(retry_policy.backoff(attempt))
+        attempt += 1
+
+# Response cache configuration
+# TTLs are in seconds per endpoint; 0 disables caching for that endpoint.
+# CALCOM_CACHE_TTLS accepts a JSON object to override them, e.g. {"/bookings": 30}
+DEFAULT_CACHE_TTLS = {
+    "/event-types": 300,
+    "/teams": 300,
+    "/users": 300,
+    "/schedules": 120,
+    "/webhooks": 300,
+    "/bookings": 0
+}
+CALCOM_CACHE_TTLS = {**DEFAULT_CACHE_TTLS, **json.loads(os.environ.get("CALCOM_CACHE_TTLS", "{}"))}
+CALCOM_CACHE_MAX_ENTRIES = int(os.environ.get("CALCOM_CACHE_MAX_ENTRIES", 512))
+CALCOM_CACHE_MAX_BYTES = int(os.environ.get("CALCOM_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+
+# Auto-pagination configuration
+# PAGE_SIZE: items requested per page while walking a list endpoint
+# PAGE_CONCURRENCY: pages fetched in parallel once the total is known
+# MAX_ITEMS / MAX_BYTES: default budget for a single auto-paginated tool call
+CALCOM_PAGE_SIZE = int(os.environ.get("CALCOM_PAGE_SIZE", 100))
+CALCOM_PAGE_CONCURRENCY = int(os.environ.get("CALCOM_PAGE_CONCURRENCY", 4))
+CALCOM_PAGINATE_MAX_ITEMS = int(os.environ.get("CALCOM_PAGINATE_MAX_ITEMS", 1000))
+CALCOM_PAGINATE_MAX_BYTES = int(os.environ.get("CALCOM_PAGINATE_MAX_BYTES", 1024 * 1024))
+
+# Bookings mirror configuration
+# MIRROR_PATH: SQLite file holding a local copy of bookings (":memory:" for a
+# per-process mirror); unset disables the mirror
+# MIRROR_SYNC_INTERVAL: seconds before get_bookings fetches changes again
+# MIRROR_SYNC_WAIT: longest get_bookings waits for a sync, which carries on in
+# the background; until the first full sync is done it queries Cal.com instead
+CALCOM_MIRROR_PATH = os.environ.get("CALCOM_MIRROR_PATH", "")
+CALCOM_MIRROR_SYNC_INTERVAL = float(os.environ.get("CALCOM_MIRROR_SYNC_INTERVAL", 60))
+CALCOM_MIRROR_SYNC_WAIT = float(os.environ.get("CALCOM_MIRROR_SYNC_WAIT", 5))
+
+# Webhook configuration
+# WEBHOOK_SECRET: secret set on the Cal.com webhook; events posted to
+# /webhooks/calcom are rejected unless their X-Cal-Signature-256 matches
+CALCOM_WEBHOOK_SECRET = os.environ.get("CALCOM_WEBHOOK_SECRET", "")
+
+# Batch booking configuration
+# BATCH_CONCURRENCY: bookings created at the same time by create_bookings
+# BATCH_MAX_ITEMS: largest batch accepted in one create_bookings call
+CALCOM_BATCH_CONCURRENCY = int(os.environ.get("CALCOM_BATCH_CONCURRENCY", 4))
+CALCOM_BATCH_MAX_ITEMS = int(os.environ.get("CALCOM_BATCH_MAX_ITEMS", 100))
+
+# Idempotency configuration
+# IDEMPOTENCY_TTL: seconds a successful booking is replayed for a repeated
+# idempotency key instead of booking again; 0 disables duplicate suppression
+# IDEMPOTENCY_MAX_ENTRIES: remembered bookings, least recently used dropped first
+CALCOM_IDEMPOTENCY_TTL = float(os.environ.get("CALCOM_IDEMPOTENCY_TTL", 600))
+CALCOM_IDEMPOTENCY_MAX_ENTRIES = int(os.environ.get("CALCOM_IDEMPOTENCY_MAX_ENTRIES", 1024))
+
+# Default field projections; tools return only these dotted paths unless the
+# caller passes `fields` (use ["*"] for the full Cal.com payload)
+DEFAULT_BOOKING_FIELDS = [
+    "id", "uid", "title", "status", "start", "end", "duration", "eventTypeId",
+    "meetingUrl", "location", "hosts.id", "hosts.name", "hosts.email",
+    "attendees.name", "attendees.email", "attendees.timeZone"
+]
+DEFAULT_EVENT_TYPE_FIELDS = [
+    "id", "title", "slug", "lengthInMinutes", "length", "description", "hidden", "locations.type"
+]
+
+def endpoint_group(endpoint: str) -> str:
+    """Get the top-level resource of an endpoint, e.g. /bookings/abc -> /bookings"""
+    return "/" + endpoint.strip("/").split("/", 1)[0]
+
+class CacheEntry:
+    """A cached response body with its expiry and HTTP validators"""
+    __slots__ = ("value", "size", "expires_at", "etag", "last_modified")
+
+    def __init__(self, value: Any, size: int, expires_at: float, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def validator_headers(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """
+    Bounded in-process cache of GET responses with per-entry TTL and LRU eviction.
+    
+    Expired entries that carry an ETag or Last-Modified validator are kept (until
+    evicted) so they can be revalidated with a conditional request.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # least recently used first
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None, tenant: str = "") -> str:
+        """Build a tenant's cache key that does not depend on the ordering of params"""
+        canonical = {k: v for k, v in (params or {}).items() if v is not None}
+        query = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+        return f"{tenant}|/{endpoint.strip('/')}?{query}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a fresh cached value"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                if not entry.validator_headers():
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def get_stale(self, key: str) -> Optional[CacheEntry]:
+        """Get an expired entry that can be revalidated"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.validator_headers():
+                return None
+            return entry
+
+    def set(self, key: str, value: Any, size: int, ttl: float, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CacheEntry(value, size, time.monotonic() + ttl, etag, last_modified)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def revalidated(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        """Extend an entry after the upstream answered 304 Not Modified"""
+        with self._lock:
+            entry.expires_at = time.monotonic() + ttl
+            if self._entries.get(key) is entry:
+                self._entries.move_to_end(key)
+            self.revalidations += 1
+
+    def invalidate(self, endpoint: Optional[str] = None, tenant: Optional[str] = None) -> int:
+        """Drop every entry for an endpoint group (or everything when no endpoint is given) of one tenant or all of them"""
+        with self._lock:
+            keys = list(self._entries)
+            if tenant is not None:
+                keys = [k for k in keys if k.startswith(tenant + "|")]
+            if endpoint is not None:
+                group = endpoint_group(endpoint)
+                keys = [k for k in keys if k.partition("|")[2].startswith((group + "?", group + "/"))]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def _remove(self, key: str) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidations,
+                "evictions": self.evictions
+            }
+
+response_cache = ResponseCache(CALCOM_CACHE_MAX_ENTRIES, CALCOM_CACHE_MAX_BYTES)
+
+def cache_ttl(endpoint: str) -> float:
+    """Get the cache TTL for an endpoint, falling back to its top-level resource"""
+    endpoint = "/" + endpoint.strip("/")
+    if endpoint in CALCOM_CACHE_TTLS:
+        return CALCOM_CACHE_TTLS[endpoint]
+    return CALCOM_CACHE_TTLS.get(endpoint_group(endpoint), 0)
+
+def get_headers(api_key: Optional[str] = None) -> Dict[str, str]:
+    """Get headers for Cal.com API requests, using the current tool call's API key by default"""
+    api_key = api_key or current_api_key()
+    if not api_key:
         return {}
     return {
-        "Authorization": f"Bearer {CALCOM_API_KEY}",
+        "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json"
     }
 
-def make_api_request(method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
-    """Make a request to the Cal.com API"""
-    if not CALCOM_API_KEY:
+class SingleFlight:
+    """Coalesces identical concurrent calls so they share one execution"""
+
+    def __init__(self):
+        self.calls: Dict[str, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn) -> Any:
+        """Await fn(), or the in-flight call for the same key if there is one"""
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self.calls[key] = task
+            task.add_done_callback(lambda _: self.calls.pop(key, None))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        # Shielded so one caller cancelling does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self.calls),
+            "executions": self.executions,
+            "coalesced": self.coalesced
+        }
+
+singleflight = SingleFlight()
+
+class IdempotencyStore:
+    """
+    Remembers booking results by idempotency key so a repeated request is not
+    sent upstream again.
+    
+    A request whose key matches a booking in progress waits for it, and one
+    matching a successful booking from the last ttl seconds gets that result
+    back. Failed attempts are not remembered, so they can be retried. When a
+    request fingerprint is given, a key reused for a different request is
+    rejected instead of replayed.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.results: OrderedDict[str, Tuple[float, Optional[str], Dict[str, Any]]] = OrderedDict()
+        self.calls: Dict[str, Tuple[Optional[str], asyncio.Future]] = {}
+        self.executions = 0
+        self.replayed = 0
+        self.conflicts = 0
+
+    def _conflict(self, key: str) -> Dict[str, Any]:
+        self.conflicts += 1
+        return {
+            "error": "Idempotency key reused",
+            "message": f"Idempotency key {key.rsplit(':', 1)[-1]!r} was already used for a different booking request"
+        }
+
+    async def do(self, key: str, fn, fingerprint: Optional[str] = None) -> Dict[str, Any]:
+        """Await fn() unless the key has a remembered or in-flight result for the same request fingerprint"""
+        if self.ttl <= 0:
+            return await fn()
+        entry = self.results.get(key)
+        if entry is not None:
+            expires_at, stored, result = entry
+            if expires_at > time.monotonic():
+                if stored != fingerprint:
+                    return self._conflict(key)
+                self.results.move_to_end(key)
+                self.replayed += 1
+                return {**result, "idempotent_replay": True}
+            del self.results[key]
+        
+        call = self.calls.get(key)
+        if call is None:
+            task = asyncio.ensure_future(fn())
+            self.calls[key] = (fingerprint, task)
+            task.add_done_callback(lambda done: self._finish(key, fingerprint, done))
+            self.executions += 1
+            return await asyncio.shield(task)
+        stored, task = call
+        if stored != fingerprint:
+            return self._conflict(key)
+        self.replayed += 1
+        result = await asyncio.shield(task)
+        return result if "error" in result else {**result, "idempotent_replay": True}
+
+    def _finish(self, key: str, fingerprint: Optional[str], task: asyncio.Future) -> None:
+        self.calls.pop(key, None)
+        if task.cancelled() or task.exception() is not None or "error" in task.result():
+            return
+        self.results[key] = (time.monotonic() + self.ttl, fingerprint, task.result())
+        self.results.move_to_end(key)
+        while len(self.results) > self.max_entries:
+            self.results.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.results),
+            "in_flight": len(self.calls),
+            "executions": self.executions,
+            "replayed": self.replayed,
+            "conflicts": self.conflicts
+        }
+
+idempotency_store = IdempotencyStore(CALCOM_IDEMPOTENCY_TTL, CALCOM_IDEMPOTENCY_MAX_ENTRIES)
+
+async def authenticate(request: ApiRequest, call_next) -> Dict[str, Any]:
+    """Middleware adding the tool call's API key, or failing the request when there is none"""
+    if not request.api_key:
         return {
             "error": "API key not configured",
-            "message": "CALCOM_API_KEY environment variable is not set"
+            "message": "CALCOM_API_KEY environment variable is not set" + (f" and the request has no {CALCOM_API_KEY_HEADER} header" if CALCOM_API_KEY_HEADER else "")
         }
+    request.headers.update(get_headers(request.api_key))
+    return await call_next(request)
+
+async def version_headers(request: ApiRequest, call_next) -> Dict[str, Any]:
+    """Middleware adding the cal-api-version header configured for the endpoint"""
+    if request.config["api_version"]:
+        request.headers["cal-api-version"] = request.config["api_version"]
+    return await call_next(request)
+
+async def cache_lookup(request: ApiRequest, call_next) -> Dict[str, Any]:
+    """Middleware answering GETs from fresh response cache entries"""
+    if request.method == "GET" and request.transform is None and cache_ttl(request.endpoint) > 0:
+        cached = response_cache.get(request.cache_key)
+        if cached is not None:
+            return cached
+    return await call_next(request)
+
+async def coalesce(request: ApiRequest, call_next) -> Dict[str, Any]:
+    """Middleware letting identical concurrent GETs share one upstream request"""
+    if request.method != "GET" or request.transform is not None:
+        return await call_next(request)
+    return await singleflight.do(request.cache_key, lambda: call_next(request))
+
+async def cache_store(request: ApiRequest, call_next) -> Dict[str, Any]:
+    """
+    Middleware keeping the response cache current: GETs are revalidated with
+    the stale entry's validators and cached, and successful writes invalidate
+    the cached responses of their endpoint.
+    """
+    ttl = cache_ttl(request.endpoint) if request.method == "GET" and request.transform is None else 0
+    if ttl > 0:
+        request.stale = response_cache.get_stale(request.cache_key)
+        if request.stale is not None:
+            request.headers.update(request.stale.validator_headers())
     
-    url = f"{CALCOM_API_BASE}/{endpoint.lstrip('/')}"
-    headers = get_headers()
+    result = await call_next(request)
+    response = request.response
+    if response is None or "error" in result:
+        return result
+    if response.status_code == 304 and request.stale is not None:
+        response_cache.revalidated(request.cache_key, request.stale, ttl)
+    elif ttl > 0:
+        response_cache.set(
+            request.cache_key,
+            result,
+            len(response.content),
+            ttl,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified")
+        )
+    elif request.method != "GET":
+        response_cache.invalidate(request.endpoint, request.tenant)
+        if request.group == "/bookings" and uses_mirror(request.api_key):
+            booking_mirror.mark_stale()
+    return result
+
+async def decode(request: ApiRequest, call_next) -> Dict[str, Any]:
+    """
+    Middleware turning the HTTP response into a result dictionary.
     
+    Unsuccessful responses and client errors become error dictionaries. When
+    the request has a transform, the body is parsed as it streams in and each
+    item of its data array is transformed as soon as it has been parsed.
+    """
+    items = []
+    parser = None
+    if request.transform is not None:
+        transform = request.transform
+        parser = StreamingPageParser(lambda item: items.append(transform(item)))
+        request.on_chunk = parser.feed
     try:
-        if method.upper() == "GET":
-            response = requests.get(url, headers=headers, params=params)
-        elif method.upper() == "POST":
-            response = requests.post(url, headers=headers, json=data, params=params)
-        elif method.upper() == "PUT":
-            response = requests.put(url, headers=headers, json=data, params=params)
-        elif method.upper() == "DELETE":
-            response = requests.delete(url, headers=headers, params=params)
-        else:
-            return {"error": "Unsupported HTTP method", "method": method}
-        
-        if response.status_code == 200 or response.status_code == 201:
-            return response.json()
+        response = await call_next(request)
+        request.response = response
+        if response.status_code == 304 and request.stale is not None:
+            return request.stale.value
+        elif response.status_code == 200 or response.status_code == 201:
+            if parser is not None:
+                result = parser.close()
+                result["data"] = items
+                return result
+            request.decoded = decode_response(request.endpoint, response.content) if request.typed else json_loads(response.content)
+            return to_plain(request.decoded)
         else:
             return {
-                "error": "API request failed",
+                "error": request.config["error"],
                 "status_code": response.status_code,
                 "response": response.text
             }
-    except requests.exceptions.RequestException as e:
+    except http_errors() as e:
         return {
             "error": "Request exception",
             "message": str(e)
         }
+    except ValueError as e:
+        return {
+            "error": "Invalid JSON response",
+            "message": str(e)
+        }
+    except RateLimitTimeout as e:
+        return {
+            "error": "Rate limited",
+            "message": str(e)
+        }
+    except CircuitOpenError as e:
+        return {
+            "error": "Circuit open",
+            "message": str(e),
+            "retry_after": round(e.retry_after, 1)
+        }
+
+class RequestPipeline:
+    """
+    Runs every Cal.com API request through a chain of middleware ending in the
+    HTTP transport.
+    
+    A middleware is an async function (request, call_next) that can change the
+    request, answer it without calling call_next, or post-process the result.
+    The outer middleware return result dictionaries; those after decode deal in
+    HTTP responses and run once per attempt.
+    """
+
+    def __init__(self, middleware: List[Callable], handler: Callable):
+        self.middleware = list(middleware)
+        self.handler = handler
+
+    def use(self, middleware: Callable, before: Optional[Callable] = None) -> None:
+        """Add a middleware just outside `before`, or innermost when not given"""
+        index = self.middleware.index(before) if before is not None else len(self.middleware)
+        self.middleware.insert(index, middleware)
+
+    def handle(self, request: ApiRequest):
+        return self._call(0, request)
+
+    def _call(self, index: int, request: ApiRequest):
+        if index == len(self.middleware):
+            return self.handler(request)
+        return self.middleware[index](request, lambda request: self._call(index + 1, request))
+
+pipeline = RequestPipeline(
+    [authenticate, version_headers, cache_lookup, coalesce, cache_store, decode, retry, rate_limit, observe],
+    transport
+)
+
+def streams(endpoint: str) -> bool:
+    """Whether GETs of an endpoint are parsed incrementally (CALCOM_STREAMING_JSON, uncached endpoints only)"""
+    return CALCOM_STREAMING_JSON and cache_ttl(endpoint) <= 0
+
+async def make_api_request(method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None, transform: Optional[Callable[[Any], Any]] = None, typed: bool = False) -> Dict[str, Any]:
+    """
+    Make a request to the Cal.com API through the request pipeline.
+    
+    transform, if given, is applied to each item of the response's data array.
+    For endpoints that stream (see streams), the items are transformed while
+    the body is parsed and such requests bypass the cache and coalescing.
+    typed lets a GET be decoded into typed models, which keep only the
+    modeled fields; pass it only when those are all the caller returns.
+    """
+    method = method.upper()
+    if method not in ("GET", "POST", "PUT", "DELETE"):
+        return {"error": "Unsupported HTTP method", "method": method}
+    
+    if transform is not None and method == "GET" and streams(endpoint):
+        return await pipeline.handle(ApiRequest(method, endpoint, params=params, data=data, transform=transform))
+    result = await pipeline.handle(ApiRequest(method, endpoint, params=params, data=data, typed=typed and method == "GET"))
+    if transform is not None and isinstance(result.get("data"), list):
+        result = {**result, "data": [transform(item) for item in result["data"]]}
+    return result
+
+class PaginationError(Exception):
+    """Raised when a page request fails part way through a paginated walk"""
+
+    def __init__(self, result: Dict[str, Any]):
+        super().__init__(result.get("error", "Pagination failed"))
+        self.result = result
+
+def next_cursor(page: Dict[str, Any]) -> Optional[Any]:
+    """Get the cursor for the next page, if the endpoint uses cursor pagination"""
+    pagination = page.get("pagination") or {}
+    return page.get("nextCursor") or pagination.get("nextCursor")
+
+def total_pages(page: Dict[str, Any], page_size: int) -> Tuple[Optional[int], int]:
+    """Get the page count and effective page size reported by a first page, if any"""
+    pagination = page.get("pagination") or {}
+    # The API may cap the page size below what was requested
+    page_size = pagination.get("itemsPerPage") or page_size
+    if pagination.get("totalPages") is not None:
+        return pagination["totalPages"], page_size
+    if pagination.get("totalItems") is not None:
+        return -(-pagination["totalItems"] // page_size), page_size
+    return None, page_size
+
+async def fetch_page(endpoint: str, params: Dict, transform: Optional[Callable[[Any], Any]] = None, **page_params) -> Dict[str, Any]:
+    """Fetch a single page of a list endpoint, passing each item through transform"""
+    page = await make_api_request("GET", endpoint, params={**params, **page_params}, transform=transform)
+    if "error" in page:
+        raise PaginationError(page)
+    return page
+
+async def iter_items(endpoint: str, params: Optional[Dict] = None, page_size: int = CALCOM_PAGE_SIZE, max_items: Optional[int] = None, transform: Optional[Callable[[Any], Any]] = None, walk: Optional[Dict[str, Any]] = None) -> AsyncIterator[Any]:
+    """
+    Lazily walk every page of a list endpoint, yielding one item at a time.
+    
+    When the first page reports the total, the remaining pages are fetched with up
+    to CALCOM_PAGE_CONCURRENCY requests in flight and yielded in page order.
+    Otherwise pages are walked sequentially, following a cursor when the API
+    returns one and take/skip offsets when it does not. The walk ends after
+    max_items items without requesting pages that would not be needed; walk,
+    if given, then has "truncated" set when the pages already fetched show
+    there are more. Items are yielded after being passed through transform, if
+    given.
+    """
+    walk = {} if walk is None else walk
+    walk["truncated"] = False
+    params = {k: v for k, v in (params or {}).items() if v is not None}
+    params["take"] = page_size
+    page = await fetch_page(endpoint, params, transform, skip=0)
+    items = page.get("data") or []
+    yielded = 0
+    for item in items:
+        if yielded == max_items:
+            walk["truncated"] = True
+            return
+        yield item
+        yielded += 1
+    
+    pages, page_size = total_pages(page, page_size)
+    cursor = next_cursor(page)
+    if pages is not None and cursor is None:
+        needed = pages if max_items is None else min(pages, -(-max_items // page_size))
+        pending = deque()
+        next_page = 2
+        try:
+            while pending or next_page <= needed:
+                while next_page <= needed and len(pending) < CALCOM_PAGE_CONCURRENCY:
+                    skip = (next_page - 1) * page_size
+                    pending.append(asyncio.ensure_future(fetch_page(endpoint, params, transform, skip=skip)))
+                    next_page += 1
+                page = await pending.popleft()
+                for item in page.get("data") or []:
+                    if yielded == max_items:
+                        walk["truncated"] = True
+                        return
+                    yield item
+                    yielded += 1
+        finally:
+            for task in pending:
+                task.cancel()
+        walk["truncated"] = needed < pages
+        return
+    
+    skip = 0
+    while True:
+        pagination = page.get("pagination") or {}
+        has_next = pagination.get("hasNextPage", len(items) >= page_size)
+        if not items or (cursor is None and not has_next):
+            return
+        if yielded == max_items:
+            walk["truncated"] = True
+            return
+        skip += len(items)
+        if cursor is not None:
+            page = await fetch_page(endpoint, params, transform, cursor=cursor)
+        else:
+            page = await fetch_page(endpoint, params, transform, skip=skip)
+        items = page.get("data") or []
+        for item in items:
+            if yielded == max_items:
+                walk["truncated"] = True
+                return
+            yield item
+            yielded += 1
+        cursor = next_cursor(page)
+
+class FieldProjection:
+    """Keeps only the selected dotted paths of API items and counts the bytes saved"""
+
+    bytes_before = 0
+    bytes_after = 0
+    items = 0
+
+    def __init__(self, fields: Optional[List[str]], default: Optional[List[str]] = None):
+        fields = default if fields is None else fields
+        self.tree: Optional[Dict[str, Any]] = None
+        if fields and "*" not in fields:
+            self.tree = {}
+            for path in fields:
+                node = self.tree
+                for part in path.split("."):
+                    node = node.setdefault(part, {})
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return {
+            "items": cls.items,
+            "bytes_before": cls.bytes_before,
+            "bytes_after": cls.bytes_after,
+            "bytes_saved": cls.bytes_before - cls.bytes_after
+        }
+
+    def project(self, value: Any, tree: Optional[Dict[str, Any]] = None) -> Any:
+        tree = self.tree if tree is None else tree
+        if not tree:
+            return value
+        if isinstance(value, list):
+            return [self.project(v, tree) for v in value]
+        if isinstance(value, dict):
+            return {k: self.project(value[k], tree[k]) for k in tree if k in value}
+        return value
+
+    def apply(self, item: Any, size: Optional[int] = None) -> Tuple[Any, int]:
+        """Project one item, returning it with its projected size in bytes"""
+        if size is None:
+            size = len(json_dumps(item))
+        if self.tree is None:
+            return item, size
+        projected = self.project(item)
+        projected_size = len(json_dumps(projected))
+        FieldProjection.items += 1
+        FieldProjection.bytes_before += size
+        FieldProjection.bytes_after += projected_size
+        return projected, projected_size
+
+    def apply_response(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Project every item in the data list of an API response"""
+        if self.tree is None or "error" in result or not isinstance(result.get("data"), list):
+            return result
+        return {**result, "data": [self.apply(item)[0] for item in result["data"]]}
+
+async def collect_items(endpoint: str, params: Optional[Dict] = None, max_items: Optional[int] = None, max_bytes: Optional[int] = None, projection: Optional[FieldProjection] = None) -> Dict[str, Any]:
+    """Gather (projected) items from iter_items until the item or byte budget is reached"""
+    max_items = max_items if max_items is not None else CALCOM_PAGINATE_MAX_ITEMS
+    max_bytes = max_bytes if max_bytes is not None else CALCOM_PAGINATE_MAX_BYTES
+    page_size = max(1, min(CALCOM_PAGE_SIZE, max_items))
+    items = []
+    size = 0
+    truncated = False
+    walk: Dict[str, Any] = {}
+    # Items are projected as each page is parsed, so only projected items are held
+    transform = projection.apply if projection is not None else None
+    pages = iter_items(endpoint, params, page_size=page_size, max_items=max_items, transform=transform, walk=walk)
+    try:
+        async for item in pages:
+            if projection is not None:
+                item, item_size = item
+            else:
+                item_size = len(json_dumps(item))
+            if items and size + item_size > max_bytes:
+                truncated = True
+                break
+            items.append(item)
+            size += item_size
+        else:
+            # iter_items stopped at max_items or ran out; it knows which from the pages it fetched
+            truncated = walk["truncated"]
+    except PaginationError as e:
+        return {**e.result, "data": items, "pagination": {"returnedItems": len(items), "complete": False}}
+    finally:
+        await pages.aclose()
+    
+    return {
+        "status": "success",
+        "data": items,
+        "pagination": {
+            "returnedItems": len(items),
+            "returnedBytes": size,
+            "truncated": truncated
+        }
+    }
+
+def iso_utc(value: str, end_of_day: bool = False) -> str:
+    """Normalize an ISO date or datetime to the UTC format used by Cal.com, e.g. 2026-01-01T09:00:00.000Z"""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    if len(value) == 10 and end_of_day:
+        parsed = parsed.replace(hour=23, minute=59, second=59, microsecond=999000)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime("%Y-%m-%dT%H:%M:%S.") + f"{parsed.microsecond // 1000:03d}Z"
+
+class BookingMirror:
+    """
+    Local SQLite copy of bookings, kept current by incremental sync.
+    
+    Syncs walk bookings in updatedAt order from the newest updatedAt already
+    mirrored (the watermark), which is saved after every page, so an
+    interrupted sync resumes where it stopped. The first sync walks every
+    booking; the mirror is complete once one has reached the end. Queries use
+    indexes on start time, event type, host, status and attendee email.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS bookings (
+            uid TEXT PRIMARY KEY,
+            id INTEGER,
+            start TEXT,
+            end TEXT,
+            event_type_id INTEGER,
+            status TEXT,
+            recurring_uid TEXT,
+            updated_at TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS bookings_start ON bookings (start);
+        CREATE INDEX IF NOT EXISTS bookings_event_type ON bookings (event_type_id, start);
+        CREATE INDEX IF NOT EXISTS bookings_status ON bookings (status, start);
+        CREATE INDEX IF NOT EXISTS bookings_updated_at ON bookings (updated_at);
+        CREATE TABLE IF NOT EXISTS booking_users (
+            uid TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            PRIMARY KEY (user_id, uid)
+        );
+        CREATE TABLE IF NOT EXISTS booking_attendees (
+            uid TEXT NOT NULL,
+            email TEXT NOT NULL,
+            PRIMARY KEY (email, uid)
+        );
+        CREATE INDEX IF NOT EXISTS booking_users_uid ON booking_users (uid);
+        CREATE INDEX IF NOT EXISTS booking_attendees_uid ON booking_attendees (uid);
+        CREATE TABLE IF NOT EXISTS mirror_state (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    # Cal.com status views accepted by get_bookings, as conditions on the
+    # stored booking status and times
+    STATUS_VIEWS = {
+        "upcoming": "b.end >= :now AND b.status NOT IN ('cancelled', 'rejected')",
+        "past": "b.end < :now AND b.status NOT IN ('cancelled', 'rejected')",
+        "cancelled": "b.status IN ('cancelled', 'rejected')",
+        "unconfirmed": "b.status = 'pending' AND b.end >= :now",
+        "recurring": "b.recurring_uid IS NOT NULL AND b.status NOT IN ('cancelled', 'rejected')",
+        "confirmed": "b.status = 'accepted'"
+    }
+
+    def __init__(self, path: str, sync_interval: float):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.last_sync: Optional[float] = None
+        self.syncs = 0
+        self.synced_items = 0
+        self.queries = 0
+        self.sync_errors = 0
+        self.complete = False
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._sync_task: Optional[asyncio.Future] = None
+        self._stale = False
+
+    def reset(self) -> None:
+        """Forget the connection and running sync, e.g. in a forked worker process"""
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._sync_task = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.row_factory = sqlite3.Row
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(self.SCHEMA)
+        return self._db
+
+    def _run(self, fn, *args):
+        """Run a database function in a worker thread, one at a time"""
+        def locked():
+            with self._db_lock:
+                return fn(self._connect(), *args)
+        return asyncio.to_thread(locked)
+
+    @staticmethod
+    def _uid(item: Dict[str, Any]) -> str:
+        return item.get("uid") or str(item.get("id"))
+
+    @staticmethod
+    def _updated_at(item: Dict[str, Any]) -> str:
+        return item.get("updatedAt") or item.get("createdAt") or ""
+
+    @staticmethod
+    def _row(item: Dict[str, Any]) -> Tuple:
+        return (
+            BookingMirror._uid(item),
+            item.get("id"),
+            iso_utc(item["start"]) if item.get("start") else None,
+            iso_utc(item["end"]) if item.get("end") else None,
+            item.get("eventTypeId") or (item.get("eventType") or {}).get("id"),
+            (item.get("status") or "").lower(),
+            item.get("recurringBookingUid"),
+            BookingMirror._updated_at(item) or None,
+            json_dumps(item).decode()
+        )
+
+    @staticmethod
+    def _upsert(db: sqlite3.Connection, items: List[Dict[str, Any]]) -> None:
+        with db:
+            for item in items:
+                row = BookingMirror._row(item)
+                uid = row[0]
+                db.execute("INSERT OR REPLACE INTO bookings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+                db.execute("DELETE FROM booking_users WHERE uid = ?", (uid,))
+                db.execute("DELETE FROM booking_attendees WHERE uid = ?", (uid,))
+                users = {host.get("id") for host in item.get("hosts") or [] if host.get("id") is not None}
+                if item.get("userId") is not None:
+                    users.add(item["userId"])
+                db.executemany("INSERT OR IGNORE INTO booking_users VALUES (?, ?)", [(uid, user) for user in users])
+                emails = {attendee["email"].lower() for attendee in item.get("attendees") or [] if attendee.get("email")}
+                db.executemany("INSERT OR IGNORE INTO booking_attendees VALUES (?, ?)", [(uid, email) for email in emails])
+
+    @staticmethod
+    def _uids_updated_at(db: sqlite3.Connection, updated_at: str) -> set:
+        return {row["uid"] for row in db.execute("SELECT uid FROM bookings WHERE updated_at = ?", (updated_at,))}
+
+    @staticmethod
+    def _get_state(db: sqlite3.Connection, key: str) -> Optional[str]:
+        row = db.execute("SELECT value FROM mirror_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    @staticmethod
+    def _set_state(db: sqlite3.Connection, key: str, value: str) -> None:
+        with db:
+            db.execute("INSERT OR REPLACE INTO mirror_state VALUES (?, ?)", (key, value))
+
+    def is_fresh(self) -> bool:
+        return not self._stale and self.last_sync is not None and time.monotonic() - self.last_sync < self.sync_interval
+
+    def mark_stale(self) -> None:
+        """Make the next get_bookings call sync changes before answering"""
+        self._stale = True
+
+    async def set_status(self, uid: str, status: str) -> bool:
+        """Update the status of a mirrored booking; returns False if it is not mirrored"""
+        def run(db: sqlite3.Connection) -> bool:
+            with db:
+                cursor = db.execute(
+                    "UPDATE bookings SET status = ?, data = json_set(data, '$.status', ?) WHERE uid = ?",
+                    (status, status, uid)
+                )
+            return cursor.rowcount > 0
+        return await self._run(run)
+
+    def start_sync(self) -> asyncio.Future:
+        """Start a sync in the background unless one is running, and return it"""
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.ensure_future(self.sync())
+            self._sync_task.add_done_callback(self._sync_done)
+        return self._sync_task
+
+    def _sync_done(self, task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Bookings mirror sync failed: %s", task.exception())
+
+    async def sync(self) -> int:
+        """Fetch bookings changed since the watermark; raises PaginationError if the API fails"""
+        self._stale = False
+        self.complete = await self._run(self._get_state, "complete") == "1"
+        watermark = await self._run(self._get_state, "watermark")
+        # afterUpdatedAt includes bookings updated at the watermark itself, so
+        # those already stored are skipped; offsets are only used to step past
+        # a page that is entirely one updatedAt
+        seen = await self._run(self._uids_updated_at, watermark) if watermark else set()
+        skip = 0
+        count = 0
+        try:
+            while True:
+                params = {"sortUpdatedAt": "asc", "take": CALCOM_PAGE_SIZE, "skip": skip}
+                if watermark:
+                    params["afterUpdatedAt"] = watermark
+                page = await fetch_page("/bookings", params)
+                items = page.get("data") or []
+                fresh = [item for item in items if self._uid(item) not in seen]
+                if fresh:
+                    await self._run(self._upsert, fresh)
+                    count += len(fresh)
+                newest = max((self._updated_at(item) for item in items), default="")
+                # The watermark never moves back, even if a page has only older bookings
+                if newest > (watermark or ""):
+                    watermark = newest
+                    seen = {self._uid(item) for item in items if self._updated_at(item) == newest}
+                    skip = 0
+                    await self._run(self._set_state, "watermark", watermark)
+                else:
+                    seen.update(self._uid(item) for item in items)
+                    skip += len(items)
+                pagination = page.get("pagination") or {}
+                if not items or not pagination.get("hasNextPage", len(items) >= (pagination.get("itemsPerPage") or CALCOM_PAGE_SIZE)):
+                    break
+        except PaginationError:
+            self.sync_errors += 1
+            self._stale = True
+            raise
+        finally:
+            self.synced_items += count
+        if not self.complete:
+            await self._run(self._set_state, "complete", "1")
+            self.complete = True
+        self.last_sync = time.monotonic()
+        self.syncs += 1
+        return count
+
+    async def query(
+        self,
+        event_type_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        status: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        attendee_email: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Find mirrored bookings matching the get_bookings filters, ordered by start time"""
+        conditions = []
+        values: Dict[str, Any] = {"now": iso_utc(datetime.now(timezone.utc).isoformat())}
+        if event_type_id is not None:
+            conditions.append("b.event_type_id = :event_type_id")
+            values["event_type_id"] = event_type_id
+        if user_id is not None:
+            conditions.append("b.uid IN (SELECT uid FROM booking_users WHERE user_id = :user_id)")
+            values["user_id"] = user_id
+        if attendee_email:
+            conditions.append("b.uid IN (SELECT uid FROM booking_attendees WHERE email = :email)")
+            values["email"] = attendee_email.lower()
+        if status:
+            status = status.lower()
+            if status in self.STATUS_VIEWS:
+                conditions.append(self.STATUS_VIEWS[status])
+            else:
+                conditions.append("b.status = :status")
+                values["status"] = status
+        if date_from:
+            conditions.append("b.start >= :date_from")
+            values["date_from"] = iso_utc(date_from)
+        if date_to:
+            conditions.append("b.start <= :date_to")
+            values["date_to"] = iso_utc(date_to, end_of_day=True)
+        sql = "SELECT b.data FROM bookings b"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY b.start"
+        if limit is not None:
+            sql += " LIMIT :limit"
+            values["limit"] = limit
+
+        def run(db: sqlite3.Connection) -> List[Dict[str, Any]]:
+            return [json_loads(row["data"]) for row in db.execute(sql, values)]
+        self.queries += 1
+        return await self._run(run)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "path": self.path,
+            "syncs": self.syncs,
+            "synced_items": self.synced_items,
+            "sync_errors": self.sync_errors,
+            "complete": self.complete,
+            "syncing": self._sync_task is not None and not self._sync_task.done(),
+            "queries": self.queries,
+            "last_sync_age": round(time.monotonic() - self.last_sync, 1) if self.last_sync is not None else None
+        }
+
+booking_mirror = BookingMirror(CALCOM_MIRROR_PATH, CALCOM_MIRROR_SYNC_INTERVAL) if CALCOM_MIRROR_PATH else None
+
+def uses_mirror(api_key: Optional[str]) -> bool:
+    """Whether bookings for an API key are served from the mirror, which holds the CALCOM_API_KEY account"""
+    return booking_mirror is not None and api_key == CALCOM_API_KEY
+
+async def mirror_bookings(projection: FieldProjection, limit: Optional[int] = None, max_bytes: Optional[int] = None, **filters) -> Optional[Dict[str, Any]]:
+    """
+    Answer a get_bookings call from the mirror, syncing changes first when due.
+    
+    The sync runs in the background and is waited for at most
+    CALCOM_MIRROR_SYNC_WAIT seconds. If it fails or is still running, the
+    mirrored data is returned marked stale, or None while the first full sync
+    has not finished, so the caller queries Cal.com directly.
+    """
+    stale = False
+    if not booking_mirror.is_fresh():
+        try:
+            await asyncio.wait_for(asyncio.shield(booking_mirror.start_sync()), CALCOM_MIRROR_SYNC_WAIT)
+        except (asyncio.TimeoutError, PaginationError):
+            stale = True
+        if stale and not booking_mirror.complete:
+            return None
+    
+    items = await booking_mirror.query(limit=limit, **filters)
+    data = []
+    size = 0
+    for item in items:
+        item, item_size = projection.apply(item)
+        if max_bytes is not None and data and size + item_size > max_bytes:
+            break
+        data.append(item)
+        size += item_size
+    return {
+        "status": "success",
+        "data": data,
+        "pagination": {
+            "returnedItems": len(data),
+            "returnedBytes": size,
+            "truncated": len(data) < len(items),
+            "source": "mirror",
+            "stale": stale
+        }
+    }
+
+def instrumented(fn):
+    """Record call counts, errors, latency, in-flight calls and a trace span for a tool"""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        TOOL_CALLS.labels(name).inc()
+        TOOL_IN_FLIGHT.labels(name).inc()
+        start = time.perf_counter()
+        token = request_api_key.set(header_api_key())
+        with start_span(f"tool {name}", **{"mcp.tool.name": name}) as span:
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException:
+                TOOL_ERRORS.labels(name).inc()
+                raise
+            finally:
+                request_api_key.reset(token)
+                TOOL_IN_FLIGHT.labels(name).dec()
+                TOOL_LATENCY.labels(name).observe(time.perf_counter() - start)
+            if isinstance(result, dict) and "error" in result:
+                TOOL_ERRORS.labels(name).inc()
+                if span is not None:
+                    set_span_error(span, str(result["error"]))
+        return result
+
+    return wrapper
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> Response:
+    """Expose Prometheus metrics for tool calls and upstream requests"""
+    if PROMETHEUS_MULTIPROC_DIR:
+        # Add up the metrics every worker has written
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+    return Response(generate_latest(metrics_registry), media_type=CONTENT_TYPE_LATEST)
+
+# Booking statuses implied by webhook triggers that the mirror can apply
+# without waiting for the next sync
+WEBHOOK_BOOKING_STATUSES = {
+    "BOOKING_CANCELLED": "cancelled",
+    "BOOKING_REJECTED": "rejected"
+}
+webhook_stats = {"received": 0, "rejected": 0, "triggers": {}}
+
+def verify_webhook_signature(body: bytes, signature: Optional[str]) -> bool:
+    """Check an X-Cal-Signature-256 header (hex HMAC-SHA256 of the body) against CALCOM_WEBHOOK_SECRET"""
+    if not CALCOM_WEBHOOK_SECRET or not signature:
+        return False
+    expected = hmac.new(CALCOM_WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+    received = signature.strip().lower().removeprefix("sha256=")
+    # compare_digest rejects non-ASCII str, so compare bytes
+    return hmac.compare_digest(expected.encode(), received.encode("utf-8", "replace"))
+
+async def apply_webhook(trigger: str, payload: Dict[str, Any]) -> None:
+    """Invalidate cached bookings and schedules and update the mirror for a Cal.com event"""
+    if not trigger.startswith("BOOKING_"):
+        return
+    # Events do not say which API key's account they belong to, so every
+    # tenant's cached bookings and schedules are dropped
+    response_cache.invalidate("/bookings")
+    response_cache.invalidate("/schedules")
+    if booking_mirror is None:
+        return
+    booking_mirror.mark_stale()
+    status = WEBHOOK_BOOKING_STATUSES.get(trigger)
+    uid = payload.get("uid")
+    if status and uid:
+        await booking_mirror.set_status(uid, status)
+    # A reschedule replaces the original booking, which Cal.com cancels
+    if trigger == "BOOKING_RESCHEDULED" and payload.get("rescheduleUid"):
+        await booking_mirror.set_status(payload["rescheduleUid"], "cancelled")
+
+@mcp.custom_route("/webhooks/calcom", methods=["POST"])
+async def calcom_webhook(request: Request) -> Response:
+    """Receive Cal.com webhook events and push-invalidate cached bookings"""
+    if not CALCOM_WEBHOOK_SECRET:
+        return JSONResponse({"error": "Webhook secret not configured"}, status_code=503)
+    body = await request.body()
+    if not verify_webhook_signature(body, request.headers.get("X-Cal-Signature-256")):
+        webhook_stats["rejected"] += 1
+        return JSONResponse({"error": "Invalid signature"}, status_code=401)
+    try:
+        event = json_loads(body)
+        trigger = str(event.get("triggerEvent", ""))
+        payload = event.get("payload") or {}
+    except (ValueError, AttributeError):
+        return JSONResponse({"error": "Invalid JSON payload"}, status_code=400)
+    if not isinstance(payload, dict):
+        return JSONResponse({"error": "Invalid JSON payload", "message": "payload must be an object"}, status_code=400)
+    
+    webhook_stats["received"] += 1
+    webhook_stats["triggers"][trigger] = webhook_stats["triggers"].get(trigger, 0) + 1
+    await apply_webhook(trigger, payload)
+    return JSONResponse({"status": "success", "triggerEvent": trigger})
 
 @mcp.tool()
-def get_api_status() -> str:
-    """Check if the Cal.com API key is configured in the environment."""
-    if CALCOM_API_KEY:
+@instrumented
+async def get_api_status() -> str:
+    """Check if a Cal.com API key is configured in the environment or sent with the request."""
+    if request_api_key.get():
+        return "Cal.com API key from the request is ready to use."
+    elif CALCOM_API_KEY:
         return "Cal.com API key is configured and ready to use."
     else:
         return "Cal.com API key is not configured. Please set the CALCOM_API_KEY environment variable."
 
 @mcp.tool()
-def list_event_types() -> Dict[str, Any]:
-    """Fetch a list of all event types from Cal.com for the authenticated account."""
-    return make_api_request("GET", "/event-types")
+@instrumented
+async def get_client_stats() -> Dict[str, Any]:
+    """Report statistics for the Cal.com HTTP client (connection pool, response cache, request coalescing, rate limiter, retries, circuit breakers, field projection, bookings mirror, webhooks and booking idempotency)."""
+    return {
+        "json_backend": JSON_BACKEND,
+        "typed_models": {"enabled": CALCOM_TYPED_MODELS and msgspec is not None, **typed_stats},
+        "pool": get_pool_stats(),
+        "cache": response_cache.stats(),
+        "rate_limiter": rate_limiter.stats(),
+        "retries": retry_policy.stats(current_tenant()),
+        "circuit_breakers": circuit_breakers.stats(current_tenant()),
+        "singleflight": singleflight.stats(),
+        "projection": FieldProjection.stats(),
+        "mirror": booking_mirror.stats() if booking_mirror is not None else {"enabled": False},
+        "webhooks": webhook_stats,
+        "idempotency": idempotency_store.stats()
+    }
 
 @mcp.tool()
-def get_bookings(
+@instrumented
+async def list_event_types(fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Fetch a list of all event types from Cal.com for the authenticated account.
+    
+    Args:
+        fields: Dotted paths to return for each event type (e.g. 'locations.type'); defaults to a compact summary, use ['*'] for everything
+    """
+    projection = FieldProjection(fields, DEFAULT_EVENT_TYPE_FIELDS)
+    result = await make_api_request("GET", "/event-types", typed=typed_projection("/event-types", projection))
+    return projection.apply_response(result)
+
+@mcp.tool()
+@instrumented
+async def get_bookings(
     event_type_id: Optional[int] = None,
     user_id: Optional[int] = None,
     status: Optional[str] = None,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
-    limit: Optional[int] = None
+    attendee_email: Optional[str] = None,
+    limit: Optional[int] = None,
+    auto_paginate: bool = False,
+    max_bytes: Optional[int] = None,
+    fields: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Fetch a list of bookings from Cal.com with optional filters.
@@ -93,7 +2313,11 @@ def get_bookings(
         status: Filter by booking status (e.g., 'confirmed', 'cancelled')
         date_from: Filter bookings from this date (ISO format)
         date_to: Filter bookings until this date (ISO format)
+        attendee_email: Filter by attendee email address
         limit: Maximum number of bookings to return
+        auto_paginate: Walk every page instead of returning only the first one
+        max_bytes: Size budget in bytes for auto-paginated results
+        fields: Dotted paths to return for each booking (e.g. 'attendees.email'); defaults to a compact summary, use ['*'] for everything
     """
     params = {}
     if event_type_id is not None:
@@ -106,13 +2330,36 @@ def get_bookings(
         params["dateFrom"] = date_from
     if date_to:
         params["dateTo"] = date_to
+    if attendee_email:
+        params["attendeeEmail"] = attendee_email
+    
+    projection = FieldProjection(fields, DEFAULT_BOOKING_FIELDS)
+    if uses_mirror(current_api_key()):
+        result = await mirror_bookings(
+            projection,
+            event_type_id=event_type_id,
+            user_id=user_id,
+            status=status,
+            date_from=date_from,
+            date_to=date_to,
+            attendee_email=attendee_email,
+            limit=limit if limit is not None else (CALCOM_PAGINATE_MAX_ITEMS if auto_paginate else CALCOM_PAGE_SIZE),
+            max_bytes=(max_bytes if max_bytes is not None else CALCOM_PAGINATE_MAX_BYTES) if auto_paginate else None
+        )
+        if result is not None:
+            return result
+    
+    if auto_paginate:
+        return await collect_items("/bookings", params=params, max_items=limit, max_bytes=max_bytes, projection=projection)
+    
     if limit is not None:
         params["limit"] = limit
     
-    return make_api_request("GET", "/bookings", params=params)
+    if projection.tree is None:
+        return await make_api_request("GET", "/bookings", params=params)
+    return await make_api_request("GET", "/bookings", params=params, transform=lambda item: projection.apply(item)[0], typed=typed_projection("/bookings", projection))
 
-@mcp.tool()
-def create_booking(
+def booking_payload(
     start_time: str,
     attendee_name: str,
     attendee_email: str,
@@ -122,19 +2369,7 @@ def create_booking(
     meeting_url: Optional[str] = None,
     booking_questions: Optional[List[Dict]] = None
 ) -> Dict[str, Any]:
-    """
-    Create a new booking in Cal.com.
-    
-    Args:
-        start_time: The start time of the booking (ISO format)
-        attendee_name: Name of the attendee
-        attendee_email: Email of the attendee
-        event_type_id: ID of the event type to book
-        attendee_timezone: Timezone of the attendee
-        attendee_language: Language preference of the attendee
-        meeting_url: Custom meeting URL if applicable
-        booking_questions: List of additional booking questions and answers
-    """
+    """Build the POST /bookings body from create_booking arguments"""
     data = {
         "start": start_time,
         "eventTypeId": event_type_id,
@@ -153,32 +2388,118 @@ def create_booking(
     if booking_questions:
         data["bookingQuestions"] = booking_questions
     
-    # Add the specific API version header for booking creation
-    headers = get_headers()
-    headers["cal-api-version"] = "2024-08-13"
+    return data
+
+def booking_idempotency_key(data: Dict[str, Any]) -> str:
+    """Derive an idempotency key from the event type, start time and attendee email of a booking"""
+    attendee = data.get("attendee") or {}
+    parts = [str(data.get("eventTypeId")), iso_utc(str(data.get("start"))), str(attendee.get("email", "")).strip().lower()]
+    return "derived:" + hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+def booking_fingerprint(data: Dict[str, Any]) -> str:
+    """Hash a whole POST /bookings body, to tell whether an explicit idempotency key is reused for the same booking"""
+    return hashlib.sha256(json.dumps(data, sort_keys=True, separators=(",", ":"), default=str).encode()).hexdigest()
+
+async def submit_booking(data: Dict[str, Any], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+    """Create a booking from a POST /bookings body, at most once per idempotency key and API key"""
+    # A derived key already identifies the slot and attendee, while an
+    # explicit key must also match the rest of the request
+    if idempotency_key:
+        key, fingerprint = f"explicit:{idempotency_key}", booking_fingerprint(data)
+    else:
+        key, fingerprint = booking_idempotency_key(data), None
+    key = f"{current_tenant()}:{key}"
+    return await idempotency_store.do(key, lambda: make_api_request("POST", "/bookings", data=data), fingerprint)
+
+@mcp.tool()
+@instrumented
+async def create_booking(
+    start_time: str,
+    attendee_name: str,
+    attendee_email: str,
+    event_type_id: int,
+    attendee_timezone: Optional[str] = None,
+    attendee_language: Optional[str] = None,
+    meeting_url: Optional[str] = None,
+    booking_questions: Optional[List[Dict]] = None,
+    idempotency_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Create a new booking in Cal.com.
     
-    url = f"{CALCOM_API_BASE}/bookings"
-    try:
-        response = requests.post(url, headers=headers, json=data)
-        if response.status_code == 200 or response.status_code == 201:
-            return response.json()
-        else:
-            return {
-                "error": "Booking creation failed",
-                "status_code": response.status_code,
-                "response": response.text
-            }
-    except requests.exceptions.RequestException as e:
+    Args:
+        start_time: The start time of the booking (ISO format)
+        attendee_name: Name of the attendee
+        attendee_email: Email of the attendee
+        event_type_id: ID of the event type to book
+        attendee_timezone: Timezone of the attendee
+        attendee_language: Language preference of the attendee
+        meeting_url: Custom meeting URL if applicable
+        booking_questions: List of additional booking questions and answers
+        idempotency_key: Key identifying this booking request; a repeat with the same key and arguments returns the original booking instead of booking again, and reusing it with different arguments is an error. Defaults to one derived from event_type_id, start_time and attendee_email
+    """
+    return await submit_booking(booking_payload(
+        start_time,
+        attendee_name,
+        attendee_email,
+        event_type_id,
+        attendee_timezone=attendee_timezone,
+        attendee_language=attendee_language,
+        meeting_url=meeting_url,
+        booking_questions=booking_questions
+    ), idempotency_key)
+
+@mcp.tool()
+@instrumented
+async def create_bookings(bookings: List[Dict[str, Any]], max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Create several bookings in Cal.com at once.
+    
+    Args:
+        bookings: Booking specs, each with the create_booking arguments (start_time, attendee_name, attendee_email, event_type_id and optionally attendee_timezone, attendee_language, meeting_url, booking_questions, idempotency_key)
+        max_concurrency: Maximum bookings created at the same time (defaults to CALCOM_BATCH_CONCURRENCY)
+    """
+    if len(bookings) > CALCOM_BATCH_MAX_ITEMS:
         return {
-            "error": "Request exception",
-            "message": str(e)
+            "error": "Too many bookings",
+            "message": f"At most {CALCOM_BATCH_MAX_ITEMS} bookings can be created per call"
         }
+    
+    semaphore = asyncio.Semaphore(max(1, max_concurrency or CALCOM_BATCH_CONCURRENCY))
+    
+    async def create(index: int, spec: Dict[str, Any]) -> Dict[str, Any]:
+        spec = dict(spec)
+        key = spec.pop("idempotency_key", None)
+        try:
+            data = booking_payload(**spec)
+        except TypeError as e:
+            return {"index": index, "elapsed_ms": 0.0, "result": {"error": "Invalid booking spec", "message": str(e)}}
+        async with semaphore:
+            start = time.perf_counter()
+            result = await submit_booking(data, key)
+            return {"index": index, "elapsed_ms": round((time.perf_counter() - start) * 1000, 1), "result": result}
+    
+    start = time.perf_counter()
+    results = await asyncio.gather(*(create(index, spec) for index, spec in enumerate(bookings)))
+    failed = sum(1 for item in results if "error" in item["result"])
+    summary = {
+        "status": "success" if not failed else "partial",
+        "created": len(results) - failed,
+        "failed": failed,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        "results": results
+    }
+    if results and failed == len(results):
+        summary["error"] = "Booking creation failed"
+    return summary
 
 @mcp.tool()
-def list_schedules(
+@instrumented
+async def list_schedules(
     user_id: Optional[int] = None,
     team_id: Optional[int] = None,
-    limit: Optional[int] = None
+    limit: Optional[int] = None,
+    auto_paginate: bool = False
 ) -> Dict[str, Any]:
     """
     List all schedules available to the authenticated user.
@@ -187,77 +2508,206 @@ def list_schedules(
         user_id: Filter by specific user ID
         team_id: Filter by specific team ID
         limit: Maximum number of schedules to return
+        auto_paginate: Fetch every page instead of returning only the first one
     """
     params = {}
     if user_id is not None:
         params["userId"] = user_id
     if team_id is not None:
         params["teamId"] = team_id
+    if auto_paginate:
+        return await collect_items("/schedules", params=params, max_items=limit)
     if limit is not None:
         params["limit"] = limit
     
-    return make_api_request("GET", "/schedules", params=params)
+    return await make_api_request("GET", "/schedules", params=params)
 
 @mcp.tool()
-def list_teams(limit: Optional[int] = None) -> Dict[str, Any]:
+@instrumented
+async def list_teams(
+    limit: Optional[int] = None,
+    auto_paginate: bool = False
+) -> Dict[str, Any]:
     """
     List all teams available to the authenticated user.
     
     Args:
         limit: Maximum number of teams to return
+        auto_paginate: Fetch every page instead of returning only the first one
     """
     params = {}
+    if auto_paginate:
+        return await collect_items("/teams", params=params, max_items=limit)
     if limit is not None:
         params["limit"] = limit
     
-    return make_api_request("GET", "/teams", params=params)
+    return await make_api_request("GET", "/teams", params=params)
 
 @mcp.tool()
-def list_users(limit: Optional[int] = None) -> Dict[str, Any]:
+@instrumented
+async def list_users(
+    limit: Optional[int] = None,
+    auto_paginate: bool = False
+) -> Dict[str, Any]:
     """
     List all users available to the authenticated account.
     
     Args:
         limit: Maximum number of users to return
+        auto_paginate: Fetch every page instead of returning only the first one
     """
     params = {}
+    if auto_paginate:
+        return await collect_items("/users", params=params, max_items=limit)
     if limit is not None:
         params["limit"] = limit
     
-    return make_api_request("GET", "/users", params=params)
+    return await make_api_request("GET", "/users", params=params)
 
 @mcp.tool()
-def list_webhooks(limit: Optional[int] = None) -> Dict[str, Any]:
+@instrumented
+async def list_webhooks(
+    limit: Optional[int] = None,
+    auto_paginate: bool = False
+) -> Dict[str, Any]:
     """
     List all webhooks configured for the authenticated account.
     
     Args:
         limit: Maximum number of webhooks to return
+        auto_paginate: Fetch every page instead of returning only the first one
     """
     params = {}
+    if auto_paginate:
+        return await collect_items("/webhooks", params=params, max_items=limit)
     if limit is not None:
         params["limit"] = limit
     
-    return make_api_request("GET", "/webhooks", params=params)
+    return await make_api_request("GET", "/webhooks", params=params)
+
+# Multi-worker configuration
+# WORKERS: server processes started by `python app.py`. They accept
+# connections on one shared socket; each keeps its own caches and uses an
+# equal share of CALCOM_RATE_LIMIT
+CALCOM_WORKERS = int(os.environ.get("CALCOM_WORKERS", 1))
+
+def reset_after_fork() -> None:
+    """Drop connections, locks and in-flight state a forked worker must not share with its parent"""
+    global _sessions, _session_lock, _async_clients, _closing_clients
+    _sessions = OrderedDict()
+    _session_lock = threading.Lock()
+    _async_clients = OrderedDict()
+    _closing_clients = set()
+    singleflight.calls.clear()
+    idempotency_store.calls.clear()
+    if booking_mirror is not None:
+        booking_mirror.reset()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_after_fork)
+
+def serve_workers(app, host: str, port: int, workers: int) -> None:
+    """
+    Serve the ASGI app from several forked uvicorn workers sharing one socket.
+    
+    The app is created once in the parent (preloaded) and gc.freeze() keeps
+    its objects out of later collections, so workers share those memory pages
+    copy-on-write. Workers that exit unexpectedly are restarted; SIGINT and
+    SIGTERM shut all of them down. Metrics are collected across workers in
+    PROMETHEUS_MULTIPROC_DIR.
+    """
+    import gc
+    import glob
+    import shutil
+    import signal
+    import socket
+    import uvicorn
+    
+    # Files left by an earlier run would be added to this one's metrics
+    if PROMETHEUS_MULTIPROC_DIR and not CALCOM_METRICS_DIR_CREATED:
+        for path in glob.glob(os.path.join(PROMETHEUS_MULTIPROC_DIR, "*.db")):
+            os.remove(path)
+    
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    config = uvicorn.Config(app, host=host, port=port, log_level="info")
+    gc.collect()
+    gc.freeze()
+    
+    children: Dict[int, int] = {}
+    stopping = False
+    
+    def spawn(index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            rate_limiter.partition(1 / workers)
+            try:
+                uvicorn.Server(config).run(sockets=[sock])
+            finally:
+                os._exit(0)
+        children[pid] = index
+        logger.info(f"Started worker {index} (pid {pid})")
+    
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+    
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    for index in range(workers):
+        spawn(index)
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = children.pop(pid, None)
+        if PROMETHEUS_MULTIPROC_DIR:
+            # Keeps its counters but drops its in-flight gauges
+            multiprocess.mark_process_dead(pid)
+        if index is not None and not stopping:
+            logger.warning(f"Worker {index} (pid {pid}) exited with code {os.waitstatus_to_exitcode(status)}, restarting")
+            time.sleep(1)
+            spawn(index)
+    sock.close()
+    if CALCOM_METRICS_DIR_CREATED:
+        shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
 
 if __name__ == "__main__":
+    # Configure logging
+    logging.basicConfig(level=logging.INFO)
+    
     # Get port from environment variable (Render.com requirement)
     port = int(os.environ.get("PORT", 8000))
     
     logger.info(f"Starting MCP server on port {port}")
     logger.info(f"Cal.com API key configured: {'Yes' if CALCOM_API_KEY else 'No'}")
+    if CALCOM_API_KEY_HEADER:
+        logger.info(f"Accepting per-request API keys in the {CALCOM_API_KEY_HEADER} header")
     
     # Configure for web deployment
     # Use the settings approach as mentioned in the FastMCP documentation
     import uvicorn
     
-    # Create the ASGI app directly
-    app = mcp.create_app(transport="http")
+    # Create the ASGI app directly. Workers do not share MCP sessions, so
+    # any of them must be able to answer any request
+    app = mcp.http_app(transport="http", stateless_http=CALCOM_WORKERS > 1)
     
-    # Run with uvicorn directly to ensure proper host/port binding
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=port,
-        log_level="info"
-    )
+    if CALCOM_WORKERS > 1:
+        logger.info(f"Starting {CALCOM_WORKERS} workers")
+        serve_workers(app, "0.0.0.0", port, CALCOM_WORKERS)
+    else:
+        # Run with uvicorn directly to ensure proper host/port binding
+        uvicorn.run(
+            app,
+            host="0.0.0.0",
+            port=port,
+            log_level="info"
+        )
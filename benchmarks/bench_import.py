@@ -0,0 +1,104 @@
+"""
+Measure how long `import app` takes, which is the bulk of a cold start.
+
+Imports app.py in fresh interpreters with `python -X importtime`, reports the
+median import time and the slowest modules imported directly by app, and
+checks that the HTTP clients and optional packages are not loaded until first
+use. With --max-ms it exits non-zero when the median exceeds the budget, so it can
+guard against regressions in CI.
+
+    python benchmarks/bench_import.py --runs 10 --max-ms 2000
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, Any, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules app.py should only import when they are first needed (uvicorn is
+# not listed because fastmcp itself imports it)
+DEFERRED_MODULES = ["httpx", "requests", "urllib3", "msgspec", "opentelemetry.sdk"]
+
+def run_python(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    env = {**os.environ, "CALCOM_API_KEY": os.environ.get("CALCOM_API_KEY", "bench-key")}
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    return subprocess.run(args, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+def parse_importtime(output: str) -> Dict[str, Any]:
+    """Get app's cumulative import time and that of each module it imports directly, in microseconds"""
+    total = 0
+    children: Dict[str, int] = {}
+    pending: Dict[str, int] = {}
+    # A module is reported after everything it imports, so app's direct imports
+    # are the depth-1 lines since the previous top-level module
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            if name.strip() == "app":
+                total = int(cumulative)
+                children = pending
+            pending = {}
+        elif depth == 1:
+            pending[name.strip()] = pending.get(name.strip(), 0) + int(cumulative)
+    return {"total": total, "children": children}
+
+def measure(runs: int) -> Dict[str, Any]:
+    totals: List[float] = []
+    children: Dict[str, List[float]] = {}
+    for _ in range(runs):
+        sample = parse_importtime(run_python("import app", importtime=True).stderr)
+        totals.append(sample["total"] / 1000)
+        for name, micros in sample["children"].items():
+            children.setdefault(name, []).append(micros / 1000)
+    loaded = json.loads(run_python(
+        "import sys, json, app; print(json.dumps([m for m in %r if m in sys.modules]))" % DEFERRED_MODULES
+    ).stdout)
+    return {
+        "runs": runs,
+        "median_ms": statistics.median(totals),
+        "min_ms": min(totals),
+        "max_ms": max(totals),
+        "modules": sorted(
+            ({"module": name, "median_ms": statistics.median(samples)} for name, samples in children.items()),
+            key=lambda m: m["median_ms"],
+            reverse=True
+        ),
+        "deferred_modules_loaded": loaded
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the import time of app.py")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument("--top", type=int, default=10, help="Slowest direct imports to list")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if the median import time exceeds this budget")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    result["modules"] = result["modules"][:args.top]
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"import app: median {result['median_ms']:.1f} ms (min {result['min_ms']:.1f}, max {result['max_ms']:.1f}) over {result['runs']} runs")
+        print(f"{'module':<30} {'median ms':>10}")
+        for m in result["modules"]:
+            print(f"{m['module']:<30} {m['median_ms']:>10.1f}")
+        print("deferred modules loaded at import:", ", ".join(result["deferred_modules_loaded"]) or "none")
+
+    failed = bool(result["deferred_modules_loaded"])
+    if args.max_ms is not None and result["median_ms"] > args.max_ms:
+        print(f"median import time {result['median_ms']:.1f} ms exceeds the {args.max_ms:g} ms budget", file=sys.stderr)
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare JSON backends on large Cal.com booking pages.
+
+Decodes and encodes a /bookings response built from the mock dataset with the
+stdlib json module and each installed fast backend (orjson, msgspec), the same
+way app.py uses them for upstream responses and result sizing.
+
+    python benchmarks/bench_json.py --items 250 --repeat 200
+"""
+import os
+import sys
+import time
+import argparse
+from typing import Dict, Any, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import load_json_backend
+from mock_calcom import build_dataset
+
+def bench(fn, arg, repeat: int) -> float:
+    """Best-of-3 mean seconds per call"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(arg)
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON backends on booking pages")
+    parser.add_argument("--items", type=int, default=250, help="Bookings per page")
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    page = {"status": "success", "data": build_dataset(args.items)["bookings"][:args.items]}
+    results: List[Dict[str, Any]] = []
+    seen = set()
+    for name in ("stdlib", "orjson", "msgspec"):
+        backend, loads, dumps = load_json_backend(name)
+        if backend in seen:
+            continue
+        seen.add(backend)
+        body = dumps(page)
+        assert loads(body) == page
+        results.append({
+            "backend": backend,
+            "decode_ms": bench(loads, body, args.repeat) * 1000,
+            "encode_ms": bench(dumps, page, args.repeat) * 1000,
+            "bytes": len(body)
+        })
+
+    print(f"page: {args.items} bookings, {results[0]['bytes'] / 1024:.0f} KiB")
+    print(f"{'backend':<10} {'decode ms':>10} {'MB/s':>8} {'encode ms':>10} {'MB/s':>8} {'speedup':>8}")
+    baseline = results[0]["decode_ms"] + results[0]["encode_ms"]
+    for r in results:
+        mb = r["bytes"] / 1e6
+        print(
+            f"{r['backend']:<10} {r['decode_ms']:>10.3f} {mb / (r['decode_ms'] / 1000):>8.0f} "
+            f"{r['encode_ms']:>10.3f} {mb / (r['encode_ms'] / 1000):>8.0f} {baseline / (r['decode_ms'] + r['encode_ms']):>7.1f}x"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark the MCP tools end to end against a local Cal.com stand-in.
+
+Starts benchmarks/mock_calcom.py in-process, launches app.py over the MCP HTTP
+transport with CALCOM_API_BASE pointed at the mock, then calls each tool from
+several concurrent MCP sessions and reports latency percentiles and throughput.
+
+    python benchmarks/bench_tools.py --calls 200 --concurrency 16 --latency-ms 50
+"""
+import os
+import json
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+from typing import Dict, Any, List
+
+from fastmcp import Client
+
+from mock_calcom import MockCalcomServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TOOLS = {
+    "list_event_types": {},
+    "get_bookings": {"limit": 50},
+    "list_schedules": {},
+    "list_teams": {},
+    "list_users": {},
+    "list_webhooks": {},
+}
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def start_server(base_url: str, port: int, extra_env: Dict[str, str]) -> subprocess.Popen:
+    """Launch app.py over the MCP HTTP transport"""
+    env = {**os.environ, "CALCOM_API_BASE": base_url, "CALCOM_API_KEY": os.environ.get("CALCOM_API_KEY", "bench-key"), **extra_env}
+    return subprocess.Popen(
+        ["fastmcp", "run", os.path.join(ROOT, "app.py"), "--transport", "http", "--host", "127.0.0.1", "--port", str(port)],
+        env=env,
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+async def wait_for_server(url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with Client(url) as client:
+                await client.list_tools()
+                return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"MCP server at {url} did not start within {timeout:g}s")
+            await asyncio.sleep(0.2)
+
+async def bench_tool(url: str, tool: str, arguments: Dict[str, Any], calls: int, concurrency: int) -> Dict[str, Any]:
+    """Call a tool `calls` times spread over `concurrency` MCP sessions"""
+    latencies: List[float] = []
+    errors = 0
+    remaining = calls
+
+    async def session_worker():
+        nonlocal remaining, errors
+        async with Client(url) as client:
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                try:
+                    result = await client.call_tool(tool, arguments, raise_on_error=False)
+                    if result.is_error or (isinstance(result.data, dict) and "error" in result.data):
+                        errors += 1
+                except Exception:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session_worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "tool": tool,
+        "calls": len(latencies),
+        "errors": errors,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "calls_per_sec": len(latencies) / elapsed if elapsed else 0.0
+    }
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    print(f"{'tool':<20} {'calls':>6} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'calls/s':>9}")
+    for r in results:
+        print(f"{r['tool']:<20} {r['calls']:>6} {r['errors']:>6} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['calls_per_sec']:>9.1f}")
+
+async def run(args) -> List[Dict[str, Any]]:
+    mock = MockCalcomServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, size=args.bookings).start()
+    extra_env = {"CALCOM_HTTP_CLIENT": args.client}
+    if args.no_cache:
+        extra_env["CALCOM_CACHE_TTLS"] = json.dumps({endpoint: 0 for endpoint in ("/event-types", "/teams", "/users", "/schedules", "/webhooks", "/bookings")})
+    port = free_port()
+    server = start_server(mock.base_url, port, extra_env)
+    url = f"http://127.0.0.1:{port}/mcp"
+    try:
+        await wait_for_server(url)
+        tools = args.tools.split(",") if args.tools else list(TOOLS)
+        results = []
+        for tool in tools:
+            results.append(await bench_tool(url, tool, TOOLS.get(tool, {}), args.calls, args.concurrency))
+        return results
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+        mock.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MCP tool latency against a local Cal.com stand-in")
+    parser.add_argument("--calls", type=int, default=200, help="Calls per tool")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent MCP sessions")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Latency added by the mock API")
+    parser.add_argument("--jitter-ms", type=float, default=10, help="Random extra latency added by the mock API")
+    parser.add_argument("--bookings", type=int, default=1000, help="Bookings in the mock dataset")
+    parser.add_argument("--tools", default="", help="Comma separated tools to benchmark (default: all read tools)")
+    parser.add_argument("--client", choices=["async", "sync"], default="async", help="CALCOM_HTTP_CLIENT for the server")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the response cache so every call reaches the mock")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Local stand-in for the Cal.com v2 API endpoints used by app.py.
+
+Serves deterministic event types, bookings, schedules, teams, users and
+webhooks with Cal.com-style pagination, ETags and configurable latency, so
+the MCP server can be benchmarked offline.
+
+    python benchmarks/mock_calcom.py --port 8765 --latency-ms 50 --bookings 5000
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Dict, Any, List
+from urllib.parse import urlparse, parse_qs
+
+def build_dataset(size: int, seed: int = 42) -> Dict[str, List[Dict[str, Any]]]:
+    """Generate a deterministic dataset; size is the number of bookings"""
+    rng = random.Random(seed)
+    users = [
+        {"id": i, "email": f"user{i}@example.com", "name": f"User {i}", "timeZone": "Europe/London", "weekStart": "Monday"}
+        for i in range(1, max(size // 50, 5) + 1)
+    ]
+    teams = [{"id": i, "name": f"Team {i}", "slug": f"team-{i}", "isPrivate": False} for i in range(1, 11)]
+    event_types = [
+        {
+            "id": i,
+            "title": f"Meeting {i}",
+            "slug": f"meeting-{i}",
+            "lengthInMinutes": rng.choice([15, 30, 45, 60]),
+            "description": "A meeting. " * 20,
+            "locations": [{"type": "integration", "integration": "cal-video"}],
+            "bookingFields": [{"type": "name", "label": "Name", "required": True}, {"type": "email", "label": "Email", "required": True}],
+            "hidden": False,
+            "ownerId": rng.choice(users)["id"]
+        }
+        for i in range(1, 21)
+    ]
+    schedules = [
+        {
+            "id": i,
+            "ownerId": users[i % len(users)]["id"],
+            "name": f"Working hours {i}",
+            "timeZone": "Europe/London",
+            "availability": [{"days": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"], "startTime": "09:00", "endTime": "17:00"}],
+            "isDefault": i == 1,
+            "overrides": []
+        }
+        for i in range(1, max(size // 100, 5) + 1)
+    ]
+    webhooks = [
+        {"id": i, "subscriberUrl": f"https://hooks.example.com/{i}", "triggers": ["BOOKING_CREATED", "BOOKING_CANCELLED"], "active": True}
+        for i in range(1, 6)
+    ]
+    bookings = []
+    for i in range(1, size + 1):
+        event_type = rng.choice(event_types)
+        host = rng.choice(users)
+        start = 1767225600 + i * 1800
+        bookings.append({
+            "id": i,
+            "uid": hashlib.md5(str(i).encode()).hexdigest()[:22],
+            "title": f"{event_type['title']} between {host['name']} and Guest {i}",
+            "description": "Booked through the benchmark.",
+            "status": rng.choice(["accepted", "accepted", "accepted", "cancelled", "pending"]),
+            "start": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(start)),
+            "end": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(start + event_type["lengthInMinutes"] * 60)),
+            "duration": event_type["lengthInMinutes"],
+            "eventTypeId": event_type["id"],
+            "eventType": {"id": event_type["id"], "slug": event_type["slug"]},
+            "meetingUrl": f"https://app.cal.com/video/{i}",
+            "location": "integrations:daily",
+            "hosts": [{"id": host["id"], "name": host["name"], "email": host["email"], "timeZone": host["timeZone"]}],
+            "attendees": [{"name": f"Guest {i}", "email": f"guest{i}@example.org", "timeZone": "America/New_York", "language": "en", "absent": False}],
+            "bookingFieldsResponses": {"name": f"Guest {i}", "email": f"guest{i}@example.org", "notes": "Looking forward to it. " * 5},
+            "metadata": {},
+            "createdAt": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(start - 86400)),
+            "updatedAt": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(start - 3600))
+        })
+    return {
+        "event-types": event_types,
+        "bookings": bookings,
+        "schedules": schedules,
+        "teams": teams,
+        "users": users,
+        "webhooks": webhooks
+    }
+
+# Bookings are answered in the 2024-08-13 shape only when that cal-api-version
+# is requested; older versions use startTime/endTime and a single user, and
+# ignore the updatedAt filter and sort
+BOOKINGS_VERSION = "2024-08-13"
+BOOKINGS_VERSION_PARAMS = ("afterUpdatedAt", "sortUpdatedAt")
+
+def legacy_booking(booking: Dict[str, Any]) -> Dict[str, Any]:
+    legacy = {key: value for key, value in booking.items() if key not in ("start", "end", "hosts")}
+    legacy["startTime"] = booking.get("start")
+    legacy["endTime"] = booking.get("end")
+    legacy["user"] = (booking.get("hosts") or [None])[0]
+    return legacy
+
+FILTERS = {
+    "eventTypeId": lambda item, value: str(item.get("eventTypeId")) == value,
+    "status": lambda item, value: item.get("status") == value,
+    "userId": lambda item, value: any(str(h.get("id")) == value for h in item.get("hosts", [])) or str(item.get("ownerId")) == value,
+    "attendeeEmail": lambda item, value: any(a.get("email") == value for a in item.get("attendees", [])),
+    "afterUpdatedAt": lambda item, value: item.get("updatedAt", "") >= value,
+}
+
+class MockCalcomServer:
+    """Threaded HTTP server answering a subset of the Cal.com v2 API"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0, jitter_ms: float = 0, size: int = 1000, max_page_size: int = 250):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.max_page_size = max_page_size
+        self.data = build_dataset(size)
+        self.requests = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v2"
+
+    def start(self) -> "MockCalcomServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _delay(self):
+                with server._lock:
+                    server.requests += 1
+                delay = server.latency + random.uniform(0, server.jitter)
+                if delay > 0:
+                    time.sleep(delay)
+
+            def _send_json(self, status: int, body: Any) -> None:
+                payload = json.dumps(body).encode()
+                etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+                if self.command == "GET" and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if self.command == "GET":
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._delay()
+                url = urlparse(self.path)
+                parts = url.path.strip("/").split("/")
+                if len(parts) < 2 or parts[0] != "v2" or parts[1] not in server.data:
+                    return self._send_json(404, {"status": "error", "error": {"code": "NotFound", "message": url.path}})
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                items = server.data[parts[1]]
+                legacy = parts[1] == "bookings" and self.headers.get("cal-api-version") != BOOKINGS_VERSION
+                if legacy:
+                    items = [legacy_booking(item) for item in items]
+                    query = {k: v for k, v in query.items() if k not in BOOKINGS_VERSION_PARAMS}
+                if len(parts) > 2:
+                    match = [item for item in items if str(item.get("id")) == parts[2] or item.get("uid") == parts[2]]
+                    if not match:
+                        return self._send_json(404, {"status": "error", "error": {"code": "NotFound", "message": url.path}})
+                    return self._send_json(200, {"status": "success", "data": match[0]})
+                for name, check in FILTERS.items():
+                    if name in query:
+                        items = [item for item in items if check(item, query[name])]
+                if query.get("sortUpdatedAt") in ("asc", "desc"):
+                    items = sorted(items, key=lambda item: item.get("updatedAt", ""), reverse=query["sortUpdatedAt"] == "desc")
+                take = min(int(query.get("take", query.get("limit", 100))), server.max_page_size)
+                skip = int(query.get("skip", 0))
+                page = items[skip:skip + take]
+                total_pages = max(-(-len(items) // take), 1)
+                return self._send_json(200, {
+                    "status": "success",
+                    "data": page,
+                    "pagination": {
+                        "totalItems": len(items),
+                        "remainingItems": max(len(items) - skip - len(page), 0),
+                        "returnedItems": len(page),
+                        "itemsPerPage": take,
+                        "currentPage": skip // take + 1,
+                        "totalPages": total_pages,
+                        "hasNextPage": skip + take < len(items),
+                        "hasPreviousPage": skip > 0
+                    }
+                })
+
+            def do_POST(self):
+                self._delay()
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if urlparse(self.path).path.rstrip("/") != "/v2/bookings":
+                    return self._send_json(404, {"status": "error"})
+                with server._lock:
+                    booking_id = len(server.data["bookings"]) + 1
+                    booking = {
+                        "id": booking_id,
+                        "uid": hashlib.md5(str(booking_id).encode()).hexdigest()[:22],
+                        "status": "accepted",
+                        "start": body.get("start"),
+                        "eventTypeId": body.get("eventTypeId"),
+                        "attendees": [body.get("attendee", {})],
+                        "updatedAt": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+                    }
+                    server.data["bookings"].append(booking)
+                return self._send_json(201, {"status": "success", "data": booking})
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Cal.com v2 API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50, help="Fixed latency added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra latency added to every request")
+    parser.add_argument("--bookings", type=int, default=1000, help="Number of bookings in the dataset")
+    args = parser.parse_args()
+
+    server = MockCalcomServer(args.host, args.port, args.latency_ms, args.jitter_ms, args.bookings)
+    print(f"Mock Cal.com API listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
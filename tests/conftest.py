@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pytest
+from collections import OrderedDict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# app reads its configuration at import time; typed models are defined so they
+# can be tested, and switched on per test
+os.environ.setdefault("CALCOM_API_KEY", "test-key")
+os.environ.setdefault("CALCOM_TYPED_MODELS", "true")
+os.environ.pop("CALCOM_MIRROR_PATH", None)
+os.environ.pop("CALCOM_WEBHOOK_SECRET", None)
+
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import app
+from mock_calcom import MockCalcomServer
+
+@pytest.fixture(autouse=True)
+def plain_models(monkeypatch):
+    monkeypatch.setattr(app, "CALCOM_TYPED_MODELS", False)
+
+@pytest.fixture
+def mock_api(monkeypatch):
+    """A local Cal.com stand-in that app sends its requests to"""
+    server = MockCalcomServer(size=200).start()
+    monkeypatch.setattr(app, "CALCOM_API_BASE", server.base_url.rstrip("/"))
+    # asyncio clients belong to the event loop of the test that created them
+    monkeypatch.setattr(app, "_async_clients", OrderedDict())
+    # Fresh breakers and retry budget, without backoff delays
+    monkeypatch.setattr(app, "circuit_breakers", app.CircuitBreakers(app.CALCOM_BREAKER_FAILURES, app.CALCOM_BREAKER_RESET_TIMEOUT))
+    monkeypatch.setattr(app, "retry_policy", app.RetryPolicy(
+        app.CALCOM_RETRY_ATTEMPTS, 0, 0, app.CALCOM_RETRY_METHODS, app.CALCOM_RETRY_STATUSES,
+        app.CALCOM_RETRY_BUDGET_RATIO, app.CALCOM_RETRY_BUDGET_RESERVE
+    ))
+    app.response_cache.invalidate()
+    yield server
+    server.stop()
+    app.response_cache.invalidate()
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+import app
+
+BOOKING = {"start_time": "2030-01-01T10:00:00Z", "attendee_name": "Ada", "attendee_email": "ada@example.org", "event_type_id": 1}
+
+@pytest.fixture(autouse=True)
+def store(monkeypatch):
+    store = app.IdempotencyStore(600, 100)
+    monkeypatch.setattr(app, "idempotency_store", store)
+    return store
+
+def bookings_created(mock_api):
+    return len(mock_api.data["bookings"]) - 200
+
+def test_repeated_explicit_key_replays_the_booking(mock_api):
+
+    async def run():
+        return await app.create_booking(**BOOKING, idempotency_key="k1"), await app.create_booking(**BOOKING, idempotency_key="k1")
+    first, second = asyncio.run(run())
+    assert second["idempotent_replay"] is True
+    assert second["data"] == first["data"]
+    assert bookings_created(mock_api) == 1
+
+def test_explicit_key_reused_for_another_booking_is_rejected(mock_api, store):
+
+    async def run():
+        first = await app.create_booking(**BOOKING, idempotency_key="k1")
+        moved = await app.create_booking(**{**BOOKING, "start_time": "2030-01-02T10:00:00Z"}, idempotency_key="k1")
+        other = await app.create_booking(**{**BOOKING, "attendee_email": "bob@example.org"}, idempotency_key="k1")
+        return first, moved, other
+    first, moved, other = asyncio.run(run())
+    assert "error" not in first
+    assert moved["error"] == other["error"] == "Idempotency key reused"
+    assert store.conflicts == 2
+    assert bookings_created(mock_api) == 1
+
+def test_key_reused_while_the_first_booking_is_in_flight(mock_api):
+    mock_api.latency = 0.1
+
+    async def run():
+        return await asyncio.gather(
+            app.create_booking(**BOOKING, idempotency_key="k1"),
+            app.create_booking(**BOOKING, idempotency_key="k1"),
+            app.create_booking(**{**BOOKING, "attendee_name": "Bob"}, idempotency_key="k1")
+        )
+    first, same, different = asyncio.run(run())
+    assert "error" not in first and same["idempotent_replay"] is True
+    assert different["error"] == "Idempotency key reused"
+    assert bookings_created(mock_api) == 1
+
+def test_derived_key_replays_the_same_slot_and_attendee(mock_api):
+
+    async def run():
+        return await app.create_booking(**BOOKING), await app.create_booking(**{**BOOKING, "attendee_email": "ADA@example.org"})
+    _, second = asyncio.run(run())
+    assert second["idempotent_replay"] is True
+    assert bookings_created(mock_api) == 1
+
+def test_failed_bookings_are_not_remembered(mock_api):
+    handler = mock_api.httpd.RequestHandlerClass
+    do_post = handler.do_POST
+
+    def reject(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send_json(400, {"status": "error"})
+    handler.do_POST = reject
+
+    async def run():
+        failed = await app.create_booking(**BOOKING, idempotency_key="k1")
+        handler.do_POST = do_post
+        return failed, await app.create_booking(**BOOKING, idempotency_key="k1")
+    try:
+        failed, retried = asyncio.run(run())
+    finally:
+        handler.do_POST = do_post
+    assert failed["error"] == "Booking creation failed"
+    assert "error" not in retried and "idempotent_replay" not in retried
@@ -0,0 +1,151 @@
+import asyncio
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+import app
+
+@pytest.fixture
+def mirror():
+    return app.BookingMirror(":memory:", 60)
+
+@pytest.fixture
+def requests_seen(mock_api):
+    """Query parameters of every GET the mock answers"""
+    seen = []
+    handler = mock_api.httpd.RequestHandlerClass
+    do_get = handler.do_GET
+
+    def record(self):
+        seen.append({k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()})
+        return do_get(self)
+    handler.do_GET = record
+    yield seen
+    handler.do_GET = do_get
+
+@pytest.fixture
+def versions_seen(mock_api):
+    """cal-api-version header of every GET the mock answers"""
+    seen = []
+    handler = mock_api.httpd.RequestHandlerClass
+    do_get = handler.do_GET
+
+    def record(self):
+        seen.append(self.headers.get("cal-api-version"))
+        return do_get(self)
+    handler.do_GET = record
+    yield seen
+    handler.do_GET = do_get
+
+@pytest.fixture
+def outage(mock_api):
+    """Call with a request count to make the mock answer 500 from then on, and with None to end it"""
+    handler = mock_api.httpd.RequestHandlerClass
+    do_get = handler.do_GET
+    state = {"after": None}
+
+    def maybe_fail(self):
+        if state["after"] is not None and mock_api.requests >= state["after"]:
+            return self._send_json(500, {"status": "error"})
+        return do_get(self)
+    handler.do_GET = maybe_fail
+    yield lambda after: state.update(after=after)
+    handler.do_GET = do_get
+
+async def mirrored_uids(mirror):
+    return await mirror._run(lambda db: {row["uid"] for row in db.execute("SELECT uid FROM bookings")})
+
+def all_uids(mock_api):
+    return {booking["uid"] for booking in mock_api.data["bookings"]}
+
+def test_sync_walks_by_updated_at(mirror, mock_api, requests_seen, monkeypatch):
+    monkeypatch.setattr(app, "CALCOM_PAGE_SIZE", 50)
+
+    async def run():
+        return await mirror.sync(), await mirrored_uids(mirror)
+    count, uids = asyncio.run(run())
+    assert count == 200
+    assert mirror.complete
+    assert uids == all_uids(mock_api)
+    assert all(params["sortUpdatedAt"] == "asc" for params in requests_seen)
+    assert "afterUpdatedAt" not in requests_seen[0]
+    # Each page continues from the newest updatedAt of the previous one, not from an offset
+    assert all(params["skip"] == "0" for params in requests_seen)
+    assert requests_seen[1]["afterUpdatedAt"] == mock_api.data["bookings"][49]["updatedAt"]
+
+def test_sync_requests_the_2024_08_13_bookings_api(mirror, mock_api, versions_seen, monkeypatch):
+    monkeypatch.setattr(app, "CALCOM_PAGE_SIZE", 50)
+
+    async def run():
+        await mirror.sync()
+        return await mirror._run(lambda db: db.execute("SELECT COUNT(*) FROM bookings WHERE start IS NULL OR end IS NULL").fetchone()[0])
+    assert asyncio.run(run()) == 0
+    assert versions_seen and all(version == "2024-08-13" for version in versions_seen)
+
+def test_interrupted_sync_resumes_from_saved_watermark(mirror, mock_api, requests_seen, outage, monkeypatch):
+    monkeypatch.setattr(app, "CALCOM_PAGE_SIZE", 50)
+
+    async def run():
+        outage(2)
+        with pytest.raises(app.PaginationError):
+            await mirror.sync()
+        partial = await mirrored_uids(mirror)
+        outage(None)
+        requests_seen.clear()
+        await mirror.sync()
+        return partial, await mirrored_uids(mirror)
+    partial, uids = asyncio.run(run())
+    # afterUpdatedAt includes the previous page's newest booking, so the second page adds 49
+    assert len(partial) == 99
+    assert requests_seen[0]["afterUpdatedAt"] == mock_api.data["bookings"][98]["updatedAt"]
+    assert mirror.complete
+    assert uids == all_uids(mock_api)
+
+def test_sync_steps_past_pages_sharing_one_updated_at(mirror, mock_api, monkeypatch):
+    monkeypatch.setattr(app, "CALCOM_PAGE_SIZE", 20)
+    for booking in mock_api.data["bookings"][30:120]:
+        booking["updatedAt"] = "2026-06-01T00:00:00.000Z"
+
+    async def run():
+        await mirror.sync()
+        return await mirrored_uids(mirror)
+    assert asyncio.run(run()) == all_uids(mock_api)
+
+def test_later_sync_fetches_only_changes(mirror, mock_api, requests_seen):
+
+    async def run():
+        await mirror.sync()
+        mock_api.data["bookings"][5]["status"] = "cancelled"
+        mock_api.data["bookings"][5]["updatedAt"] = "2099-01-01T00:00:00.000Z"
+        requests_seen.clear()
+        return await mirror.sync()
+    assert asyncio.run(run()) == 1
+    assert len(requests_seen) == 1
+
+def test_get_bookings_does_not_wait_for_the_first_sync(mirror, mock_api, monkeypatch):
+    monkeypatch.setattr(app, "booking_mirror", mirror)
+    monkeypatch.setattr(app, "CALCOM_MIRROR_SYNC_WAIT", 0.05)
+    monkeypatch.setattr(app, "CALCOM_PAGE_SIZE", 20)
+    mock_api.latency = 0.02
+
+    async def run():
+        first = await app.get_bookings(limit=5)
+        await mirror.start_sync()
+        second = await app.get_bookings(limit=5)
+        return first, second
+    first, second = asyncio.run(run())
+    assert "source" not in first.get("pagination", {})
+    assert second["pagination"]["source"] == "mirror"
+    assert len(second["data"]) == 5
+
+def test_failed_sync_serves_stale_mirror(mirror, mock_api, outage, monkeypatch):
+    monkeypatch.setattr(app, "booking_mirror", mirror)
+
+    async def run():
+        await mirror.sync()
+        mirror.mark_stale()
+        outage(0)
+        return await app.get_bookings(limit=5)
+    result = asyncio.run(run())
+    assert result["pagination"]["source"] == "mirror"
+    assert result["pagination"]["stale"] is True
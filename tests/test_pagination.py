@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+import app
+
+@pytest.fixture
+def bookings(mock_api):
+    """Grow the mock to 250 bookings"""
+    extra = [dict(booking, id=booking["id"] + 200, uid=booking["uid"] + "x") for booking in mock_api.data["bookings"][:50]]
+    mock_api.data["bookings"].extend(extra)
+    return mock_api
+
+@pytest.fixture
+def without_totals(mock_api):
+    """Make the mock leave totals out of its pagination, so pages are walked one by one"""
+    handler = mock_api.httpd.RequestHandlerClass
+    send_json = handler._send_json
+
+    def strip_totals(self, status, body):
+        if isinstance(body, dict) and isinstance(body.get("pagination"), dict):
+            body["pagination"] = {"hasNextPage": body["pagination"]["hasNextPage"]}
+        return send_json(self, status, body)
+    handler._send_json = strip_totals
+    yield mock_api
+    handler._send_json = send_json
+
+@pytest.mark.parametrize("totals", [True, False])
+@pytest.mark.parametrize("limit, returned, truncated", [(200, 200, True), (150, 150, True), (250, 250, False), (300, 250, False)])
+def test_limit_fetches_only_the_pages_it_needs(bookings, request, totals, limit, returned, truncated):
+    if not totals:
+        request.getfixturevalue("without_totals")
+    result = asyncio.run(app.get_bookings(auto_paginate=True, limit=limit))
+    assert len(result["data"]) == returned
+    assert result["pagination"]["truncated"] is truncated
+    # Pages of 100 up to the limit, and never a page just to learn there are more
+    assert bookings.requests == -(-min(limit, 250) // 100)
+
+def test_byte_budget_truncates(mock_api):
+    result = asyncio.run(app.get_bookings(auto_paginate=True, limit=200, max_bytes=2000))
+    assert 0 < len(result["data"]) < 200
+    assert result["pagination"]["truncated"] is True
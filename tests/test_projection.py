@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+import app
+
+@pytest.fixture
+def bookings_seen(mock_api):
+    """cal-api-version header of every bookings GET the mock answers"""
+    seen = []
+    handler = mock_api.httpd.RequestHandlerClass
+    do_get = handler.do_GET
+
+    def record(self):
+        if self.path.startswith("/v2/bookings"):
+            seen.append(self.headers.get("cal-api-version"))
+        return do_get(self)
+    handler.do_GET = record
+    yield seen
+    handler.do_GET = do_get
+
+@pytest.mark.parametrize("auto_paginate", [False, True])
+def test_default_booking_projection_keeps_start_and_end(mock_api, bookings_seen, auto_paginate):
+    result = asyncio.run(app.get_bookings(limit=150, auto_paginate=auto_paginate))
+    bookings = result["data"]
+    assert bookings
+    assert bookings_seen and all(version == "2024-08-13" for version in bookings_seen)
+    for booking, expected in zip(bookings, mock_api.data["bookings"]):
+        assert booking["start"] == expected["start"]
+        assert booking["end"] == expected["end"]
+        assert booking["hosts"] == [{key: host[key] for key in ("id", "name", "email")} for host in expected["hosts"]]
+        assert "startTime" not in booking and "description" not in booking
+
+def test_default_projection_matches_the_typed_result(mock_api, monkeypatch):
+    if app.msgspec is None:
+        pytest.skip("msgspec is not installed")
+
+    async def run():
+        plain = await app.get_bookings(limit=20)
+        app.response_cache.invalidate()
+        monkeypatch.setattr(app, "CALCOM_TYPED_MODELS", True)
+        return plain, await app.get_bookings(limit=20)
+    plain, typed = asyncio.run(run())
+    assert typed == plain
+    assert all(booking["start"] and booking["end"] for booking in typed["data"])
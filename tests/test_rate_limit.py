@@ -0,0 +1,97 @@
+import time
+import asyncio
+
+import pytest
+
+import app
+from app import TokenBucket, RateLimiter
+
+def test_partitioned_bucket_refills_at_its_share():
+    bucket = TokenBucket(120, 60, share=0.25)
+    assert bucket.capacity == 30
+    assert bucket.tokens == 30
+    assert bucket.refill_rate == pytest.approx(0.25 * 120 / 60)
+    
+    bucket.tokens = 0
+    bucket.updated = time.monotonic() - 10
+    bucket.refill()
+    assert bucket.tokens == pytest.approx(5, abs=0.1)
+
+def test_refill_is_capped_at_capacity():
+    bucket = TokenBucket(10, 60)
+    bucket.updated = time.monotonic() - 3600
+    bucket.refill()
+    assert bucket.tokens == 10
+
+def test_update_scales_reported_limit_by_share():
+    bucket = TokenBucket(120, 60, share=0.5)
+    bucket.update({"X-RateLimit-Limit": "200", "X-RateLimit-Remaining": "20"}, 200)
+    assert bucket.capacity == 100
+    assert bucket.refill_rate == pytest.approx(100 / 60)
+    assert bucket.tokens == 10
+
+def test_acquire_waits_for_a_token():
+    bucket = TokenBucket(2, 1)
+
+    async def run():
+        return [await bucket.acquire() for _ in range(3)]
+    waits = asyncio.run(run())
+    assert waits[0] < 0.05 and waits[1] < 0.05
+    assert 0.4 < waits[2] < 1.0
+
+def test_429_blocks_until_retry_after():
+    bucket = TokenBucket(100, 60)
+    bucket.update({"Retry-After": "5"}, 429)
+    assert bucket.tokens == 0
+    assert bucket.blocked_until - time.monotonic() == pytest.approx(5, abs=0.1)
+
+def test_acquire_gives_up_after_max_wait(monkeypatch):
+    monkeypatch.setattr(app, "CALCOM_RATE_LIMIT_MAX_WAIT", 1)
+    bucket = TokenBucket(100, 60)
+    bucket.update({"Retry-After": "30"}, 429)
+    with pytest.raises(app.RateLimitTimeout):
+        asyncio.run(bucket.acquire())
+
+def test_partition_resets_buckets_with_the_new_share():
+    limiter = RateLimiter(120, 60)
+    limiter.bucket("a")
+    limiter.partition(0.5)
+    assert limiter.buckets == {}
+    assert limiter.bucket("a").refill_rate == pytest.approx(1.0)
+
+def test_concurrent_waiters_are_served_in_order_at_the_refill_rate():
+    bucket = TokenBucket(2, 0.2)
+    served = []
+
+    async def take(n):
+        await bucket.acquire()
+        served.append((n, time.monotonic()))
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(take(n) for n in range(6)))
+        return start
+    start = asyncio.run(run())
+    assert [n for n, _ in served] == list(range(6))
+    # Two tokens up front, then one every 0.1s
+    assert served[-1][1] - start == pytest.approx(0.4, abs=0.1)
+
+def test_remaining_header_only_lowers_tokens():
+    bucket = TokenBucket(100, 60)
+    bucket.update({"X-RateLimit-Remaining": "40"}, 200)
+    assert bucket.tokens == pytest.approx(40)
+    bucket.update({"X-RateLimit-Remaining": "90"}, 200)
+    assert bucket.tokens == pytest.approx(40, abs=0.1)
+
+def test_exhausted_bucket_blocks_until_reset():
+    bucket = TokenBucket(100, 60)
+    bucket.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "3"}, 200)
+    assert bucket.tokens < 1
+    assert bucket.blocked_until - time.monotonic() == pytest.approx(3, abs=0.1)
+
+def test_malformed_headers_are_ignored():
+    bucket = TokenBucket(100, 60)
+    bucket.update({"X-RateLimit-Limit": "lots", "X-RateLimit-Remaining": "?", "X-RateLimit-Reset": "soon"}, 200)
+    assert bucket.capacity == 100
+    assert bucket.tokens == pytest.approx(100)
+    assert bucket.blocked_until == 0
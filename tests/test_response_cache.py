@@ -0,0 +1,190 @@
+import asyncio
+
+import pytest
+
+import app
+
+@pytest.fixture
+def paths_seen(mock_api):
+    """Path of every GET that reaches the mock"""
+    seen = []
+    handler = mock_api.httpd.RequestHandlerClass
+    do_get = handler.do_GET
+
+    def record(self):
+        seen.append(self.path.split("?")[0].removeprefix("/v2"))
+        return do_get(self)
+    handler.do_GET = record
+    yield seen
+    handler.do_GET = do_get
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Install a fresh cache; call with limits to replace it"""
+
+    def install(max_entries=100, max_bytes=1024 * 1024):
+        monkeypatch.setattr(app, "response_cache", app.ResponseCache(max_entries, max_bytes))
+        return app.response_cache
+    install()
+    return install
+
+async def get(endpoint, params=None, api_key=None):
+    token = app.request_api_key.set(api_key)
+    try:
+        return await app.make_api_request("GET", endpoint, params=params)
+    finally:
+        app.request_api_key.reset(token)
+
+def test_param_order_and_unset_params_share_an_entry(mock_api, paths_seen, cache):
+
+    async def run():
+        await get("/event-types", {"a": 1, "b": "x"})
+        await get("/event-types", {"b": "x", "a": 1, "c": None})
+        await get("/event-types", {"a": 2, "b": "x"})
+    asyncio.run(run())
+    assert paths_seen == ["/event-types", "/event-types"]
+    assert app.ResponseCache.make_key("/event-types", {"b": 1, "a": 2}) == app.ResponseCache.make_key("event-types/", {"a": 2, "b": 1, "c": None})
+    assert app.response_cache.stats()["hits"] == 1
+
+def test_least_recently_used_entry_is_evicted_by_count(mock_api, paths_seen, cache):
+    cache(max_entries=2)
+
+    async def run():
+        await get("/event-types")
+        await get("/schedules")
+        await get("/event-types")
+        await get("/users")
+        paths_seen.clear()
+        await get("/event-types")
+        await get("/users")
+        await get("/schedules")
+    asyncio.run(run())
+    assert paths_seen == ["/schedules"]
+    assert app.response_cache.stats()["evictions"] == 2
+
+def test_entries_are_evicted_by_bytes(mock_api, paths_seen, cache):
+
+    async def run():
+        await get("/teams")
+        size = app.response_cache.stats()["bytes"]
+        # Room for two bodies of this size, not three
+        cache(max_bytes=size * 2 + size // 2)
+        for n in range(3):
+            await get("/teams", {"n": n})
+        stats = app.response_cache.stats()
+        paths_seen.clear()
+        for n in (2, 1, 0):
+            await get("/teams", {"n": n})
+        return size, stats
+    size, stats = asyncio.run(run())
+    assert stats["entries"] == 2
+    assert stats["bytes"] == size * 2
+    assert stats["evictions"] == 1
+    # Only n=0, the least recently used, was evicted
+    assert paths_seen == ["/teams"]
+
+def test_responses_larger_than_the_cache_are_not_stored(mock_api, paths_seen, cache):
+    cache(max_bytes=10)
+
+    async def run():
+        await get("/teams")
+        await get("/teams")
+    asyncio.run(run())
+    assert paths_seen == ["/teams", "/teams"]
+    assert app.response_cache.stats()["entries"] == 0
+
+def test_invalidate_by_tenant_and_group(mock_api, paths_seen, cache):
+
+    async def run():
+        for api_key in ("tenant-a", "tenant-b"):
+            await get("/event-types", api_key=api_key)
+            await get("/event-types/1", api_key=api_key)
+            await get("/schedules", api_key=api_key)
+        dropped = [
+            app.response_cache.invalidate("/event-types", app.tenant_id("tenant-a")),
+            app.response_cache.invalidate("/schedules"),
+        ]
+        paths_seen.clear()
+        for api_key in ("tenant-a", "tenant-b"):
+            await get("/event-types", api_key=api_key)
+            await get("/event-types/1", api_key=api_key)
+            await get("/schedules", api_key=api_key)
+        return dropped
+    dropped = asyncio.run(run())
+    assert dropped == [2, 2]
+    assert paths_seen == ["/event-types", "/event-types/1", "/schedules", "/schedules"]
+
+def test_writes_invalidate_only_their_tenants_group(mock_api, paths_seen, cache, monkeypatch):
+    monkeypatch.setattr(app, "CALCOM_CACHE_TTLS", {**app.CALCOM_CACHE_TTLS, "/bookings": 300})
+    booking = {"start": "2030-01-01T10:00:00Z", "eventTypeId": 1, "attendee": {"name": "Ada", "email": "ada@example.org", "timeZone": "UTC"}}
+
+    async def run():
+        for api_key in ("tenant-a", "tenant-b"):
+            await get("/bookings", api_key=api_key)
+            await get("/event-types", api_key=api_key)
+        token = app.request_api_key.set("tenant-a")
+        try:
+            created = await app.make_api_request("POST", "/bookings", data=booking)
+        finally:
+            app.request_api_key.reset(token)
+        paths_seen.clear()
+        for api_key in ("tenant-a", "tenant-b"):
+            await get("/bookings", api_key=api_key)
+            await get("/event-types", api_key=api_key)
+        return created
+    created = asyncio.run(run())
+    assert "error" not in created
+    assert paths_seen == ["/bookings"]
+
+@pytest.fixture
+def validators_seen(mock_api):
+    """If-None-Match header of every GET that reaches the mock"""
+    seen = []
+    handler = mock_api.httpd.RequestHandlerClass
+    do_get = handler.do_GET
+
+    def record(self):
+        seen.append(self.headers.get("If-None-Match"))
+        return do_get(self)
+    handler.do_GET = record
+    yield seen
+    handler.do_GET = do_get
+
+def expire(key):
+    app.response_cache._entries[key].expires_at = 0
+
+def test_expired_entry_is_revalidated_with_its_etag(mock_api, validators_seen, cache):
+    key = app.ResponseCache.make_key("/teams", tenant=app.tenant_id("test-key"))
+
+    async def run():
+        first = await get("/teams")
+        etag = app.response_cache._entries[key].etag
+        expire(key)
+        second = await get("/teams")
+        third = await get("/teams")
+        return first, second, third, etag
+    first, second, third, etag = asyncio.run(run())
+    assert etag
+    # The cache hit after revalidation does not reach the mock
+    assert validators_seen == [None, etag]
+    assert second == third == first
+    assert second["data"] == mock_api.data["teams"]
+    stats = app.response_cache.stats()
+    assert stats["revalidated"] == 1
+    assert stats["hits"] == 1
+    assert app.response_cache.get(key) is not None
+
+def test_changed_resource_replaces_the_expired_entry(mock_api, validators_seen, cache):
+    key = app.ResponseCache.make_key("/teams", tenant=app.tenant_id("test-key"))
+
+    async def run():
+        await get("/teams")
+        etag = app.response_cache._entries[key].etag
+        expire(key)
+        mock_api.data["teams"][0]["name"] = "Renamed"
+        return etag, await get("/teams")
+    etag, result = asyncio.run(run())
+    assert validators_seen == [None, etag]
+    assert result["data"][0]["name"] == "Renamed"
+    assert app.response_cache._entries[key].etag != etag
+    assert app.response_cache.stats()["revalidated"] == 0
@@ -0,0 +1,93 @@
+import socket
+import asyncio
+
+import pytest
+
+import app
+
+BOOKING = {"start": "2030-01-01T10:00:00Z", "eventTypeId": 1, "attendee": {"name": "Ada", "email": "ada@example.org", "timeZone": "UTC"}}
+
+@pytest.fixture
+def upstream(mock_api):
+    """Method of every request the mock answers; queue statuses in .fail to answer them before the real responses"""
+    handler = mock_api.httpd.RequestHandlerClass
+    do_get, do_post = handler.do_GET, handler.do_POST
+
+    class Upstream:
+        methods = []
+        fail = []
+
+    def wrap(do):
+        def maybe_fail(self):
+            Upstream.methods.append(self.command)
+            if Upstream.fail:
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                return self._send_json(Upstream.fail.pop(0), {"status": "error"})
+            return do(self)
+        return maybe_fail
+    handler.do_GET, handler.do_POST = wrap(do_get), wrap(do_post)
+    yield Upstream
+    handler.do_GET, handler.do_POST = do_get, do_post
+
+@pytest.fixture
+def closed_port(monkeypatch):
+    """Point the client at a port nothing listens on"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    monkeypatch.setattr(app, "CALCOM_API_BASE", f"http://127.0.0.1:{port}/v2")
+
+def test_get_is_retried_after_5xx(upstream):
+    upstream.fail = [503, 502]
+    result = asyncio.run(app.make_api_request("GET", "/bookings"))
+    assert "error" not in result
+    assert upstream.methods == ["GET"] * 3
+    assert app.retry_policy.retries == 2
+
+def test_get_gives_up_after_the_retry_attempts(upstream):
+    upstream.fail = [503] * 10
+    result = asyncio.run(app.make_api_request("GET", "/bookings"))
+    assert result["status_code"] == 503
+    assert len(upstream.methods) == 1 + app.CALCOM_RETRY_ATTEMPTS
+
+def test_client_errors_are_not_retried(upstream):
+    upstream.fail = [404]
+    result = asyncio.run(app.make_api_request("GET", "/bookings"))
+    assert result["status_code"] == 404
+    assert upstream.methods == ["GET"]
+
+def test_post_is_never_retried(upstream):
+    upstream.fail = [503]
+    result = asyncio.run(app.make_api_request("POST", "/bookings", data=BOOKING))
+    assert result["status_code"] == 503
+    assert upstream.methods == ["POST"]
+    assert app.retry_policy.retries == 0
+
+def test_connection_errors_are_retried_for_get(mock_api, closed_port):
+    result = asyncio.run(app.make_api_request("GET", "/bookings"))
+    assert result["error"] == "Request exception"
+    assert app.retry_policy.retries == app.CALCOM_RETRY_ATTEMPTS
+
+def test_connection_errors_are_not_retried_for_post(mock_api, closed_port):
+    result = asyncio.run(app.make_api_request("POST", "/bookings", data=BOOKING))
+    assert result["error"] == "Request exception"
+    assert app.retry_policy.retries == 0
+
+def test_streamed_request_is_not_retried_after_a_broken_body(mock_api, upstream, monkeypatch):
+    monkeypatch.setattr(app, "CALCOM_STREAMING_JSON", True)
+    handler = mock_api.httpd.RequestHandlerClass
+
+    def truncated(self):
+        upstream.methods.append(self.command)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "100000")
+        self.end_headers()
+        self.wfile.write(b'{"status":"success","data":[{"id":1},')
+        self.wfile.flush()
+        self.close_connection = True
+    monkeypatch.setattr(handler, "do_GET", truncated)
+    result = asyncio.run(app.get_bookings())
+    assert result["error"] == "Request exception"
+    assert upstream.methods == ["GET"]
+    assert app.retry_policy.retries == 0
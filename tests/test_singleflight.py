@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+import app
+
+@pytest.fixture(autouse=True)
+def singleflight(monkeypatch):
+    singleflight = app.SingleFlight()
+    monkeypatch.setattr(app, "singleflight", singleflight)
+    return singleflight
+
+@pytest.fixture
+def slow_api(mock_api):
+    """Requests stay in flight long enough to overlap"""
+    mock_api.latency = 0.2
+    return mock_api
+
+def test_concurrent_identical_gets_share_one_request(slow_api, singleflight):
+
+    async def run():
+        return await asyncio.gather(*(app.make_api_request("GET", "/bookings", params={"status": "accepted"}) for _ in range(5)))
+    results = asyncio.run(run())
+    assert slow_api.requests == 1
+    assert all("error" not in result for result in results)
+    assert all(result == results[0] for result in results)
+    assert singleflight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+def test_different_requests_are_not_coalesced(slow_api, singleflight):
+
+    async def run():
+        return await asyncio.gather(
+            app.make_api_request("GET", "/bookings", params={"status": "accepted"}),
+            app.make_api_request("GET", "/bookings", params={"status": "cancelled"})
+        )
+    accepted, cancelled = asyncio.run(run())
+    assert slow_api.requests == 2
+    assert accepted != cancelled
+    assert singleflight.coalesced == 0
+
+def test_cancelled_caller_does_not_cancel_the_others(slow_api, singleflight):
+
+    async def run():
+        # The first caller starts the shared request, then goes away
+        callers = [asyncio.create_task(app.make_api_request("GET", "/bookings")) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        callers[0].cancel()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        return results
+    first, *others = asyncio.run(run())
+    assert isinstance(first, asyncio.CancelledError)
+    assert slow_api.requests == 1
+    assert all("error" not in result and result["data"] for result in others)
+    assert others[0] == others[1]
+    assert singleflight.stats()["in_flight"] == 0
@@ -0,0 +1,70 @@
+import json
+import random
+
+import pytest
+
+from app import StreamingPageParser
+
+DOCUMENTS = [
+    {"data": []},
+    {"data": [1, -2.5, 1e10, True, None, "x"]},
+    {"status": "success", "data": [{"id": 1, "title": "a \"quoted\" } ] title"}, {"id": 22, "tags": [[], {}]}], "pagination": {"hasNextPage": False}},
+    {"meta": {"data": [1]}, "data": [{"name": "Zoë ☕", "nested": {"data": [3]}}], "total": 12345},
+]
+
+def parse(body, splits=()):
+    items = []
+    parser = StreamingPageParser(items.append)
+    start = 0
+    for end in sorted(splits):
+        parser.feed(body[start:end])
+        start = end
+    parser.feed(body[start:])
+    return parser.close(), items
+
+def expected(document):
+    envelope = {key: value for key, value in document.items() if key != "data"}
+    return envelope, document["data"]
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_every_split_point_matches_json_loads(document):
+    body = json.dumps(document, ensure_ascii=False).encode()
+    for split in range(len(body) + 1):
+        assert parse(body, [split]) == expected(json.loads(body))
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_random_chunking_matches_json_loads(document):
+    rng = random.Random(17)
+    for indent in (None, 2):
+        body = json.dumps(document, ensure_ascii=False, indent=indent).encode()
+        for _ in range(200):
+            splits = rng.sample(range(len(body) + 1), rng.randint(1, min(20, len(body))))
+            assert parse(body, splits) == expected(json.loads(body))
+
+def test_single_byte_chunks():
+    body = json.dumps(DOCUMENTS[3], ensure_ascii=False).encode()
+    assert parse(body, range(len(body))) == expected(DOCUMENTS[3])
+
+def test_trailing_whitespace_is_accepted():
+    assert parse(b'{"data": [1]}\r\n  ') == ({}, [1])
+
+@pytest.mark.parametrize("body", [
+    b'{"data":[1,]}',
+    b'{"data":[1],}',
+    b'{"a":1,}',
+    b'{"data":[1]}garbage',
+    b'{"data":[1]}{"data":[2]}',
+    b'{"data":[1 2]}',
+    b'{"data":[,1]}',
+    b'{"a" 1}',
+    b'{1:2}',
+    b'[1, 2]',
+    b'{"data":[1',
+    b'{"data":[1]',
+    b'{"data":[{"id":1}',
+    b'',
+])
+def test_malformed_input_is_rejected(body):
+    for split in range(len(body) + 1):
+        with pytest.raises(ValueError):
+            parse(body, [split])
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+import app
+
+@pytest.fixture
+def failing_tenant(mock_api):
+    """Make the mock answer 503 to requests made with the API key 'broken'"""
+    handler = mock_api.httpd.RequestHandlerClass
+    do_get = handler.do_GET
+    seen = []
+
+    def maybe_fail(self):
+        seen.append(self.headers.get("Authorization"))
+        if self.headers.get("Authorization") == "Bearer broken":
+            return self._send_json(503, {"status": "error"})
+        return do_get(self)
+    handler.do_GET = maybe_fail
+    yield seen
+    handler.do_GET = do_get
+
+async def as_tenant(api_key, coro_fn):
+    token = app.request_api_key.set(api_key)
+    try:
+        return await coro_fn()
+    finally:
+        app.request_api_key.reset(token)
+
+def test_requests_use_the_tool_call_api_key(failing_tenant):
+
+    async def run():
+        await as_tenant("tenant-a", lambda: app.make_api_request("GET", "/teams"))
+        await as_tenant(None, lambda: app.make_api_request("GET", "/users"))
+    asyncio.run(run())
+    assert failing_tenant == ["Bearer tenant-a", "Bearer test-key"]
+
+def test_cached_responses_are_not_shared_between_tenants(failing_tenant):
+
+    async def run():
+        for key in ("tenant-a", "tenant-a", "tenant-b"):
+            await as_tenant(key, lambda: app.make_api_request("GET", "/teams"))
+    asyncio.run(run())
+    assert failing_tenant == ["Bearer tenant-a", "Bearer tenant-b"]
+
+def test_failing_tenant_does_not_open_other_tenants_breakers(failing_tenant):
+
+    async def run():
+        broken = [await as_tenant("broken", lambda: app.make_api_request("GET", "/bookings")) for _ in range(3)]
+        healthy = await as_tenant("healthy", lambda: app.make_api_request("GET", "/bookings"))
+        return broken, healthy
+    broken, healthy = asyncio.run(run())
+    assert broken[-1]["error"] == "Circuit open"
+    assert "error" not in healthy
+    assert app.circuit_breakers.get(app.tenant_id("broken"), "/bookings").state == "open"
+    assert app.circuit_breakers.get(app.tenant_id("healthy"), "/bookings").state == "closed"
+
+def test_retry_budget_is_per_tenant():
+    policy = app.RetryPolicy(5, 0, 0, "GET", "503", 0.1, 2)
+    assert policy.should_retry("GET", 0, 503, tenant="a")
+    assert policy.should_retry("GET", 0, 503, tenant="a")
+    assert not policy.should_retry("GET", 0, 503, tenant="a")
+    assert policy.should_retry("GET", 0, 503, tenant="b")
+    assert policy.stats("a")["budget_remaining"] == 0
+    assert policy.stats("b")["budget_remaining"] == 1
+
+def test_per_tenant_state_is_bounded():
+    breakers = app.CircuitBreakers(5, 30, max_tenants=2)
+    limiter = app.RateLimiter(120, 60, max_buckets=2)
+    policy = app.RetryPolicy(3, 0, 0, "GET", "503", 0.1, 10, max_tenants=2)
+    for tenant in ("a", "b", "a", "c"):
+        breakers.get(tenant, "/bookings")
+        limiter.bucket(tenant)
+        policy.record_request(tenant)
+    assert list(breakers.breakers) == ["a", "c"]
+    assert list(limiter.buckets) == ["a", "c"]
+    assert list(policy.budgets) == ["a", "c"]
+
+def test_missing_api_key_is_an_error(monkeypatch):
+    monkeypatch.setattr(app, "CALCOM_API_KEY", None)
+    result = asyncio.run(app.make_api_request("GET", "/teams"))
+    assert result["error"] == "API key not configured"
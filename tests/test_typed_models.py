@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+import app
+
+pytestmark = pytest.mark.skipif(app.msgspec is None, reason="msgspec is not installed")
+
+@pytest.fixture
+def typed(monkeypatch):
+    monkeypatch.setattr(app, "CALCOM_TYPED_MODELS", True)
+
+@pytest.fixture
+def extra_fields(mock_api):
+    """Give the mock data fields the typed models do not declare"""
+    for i, booking in enumerate(mock_api.data["bookings"]):
+        booking["userId"] = 999 if i % 20 == 0 else booking["hosts"][0]["id"]
+        if i % 30 == 0:
+            booking["recurringBookingUid"] = f"series-{i // 90}"
+    for event_type in mock_api.data["event-types"]:
+        event_type["lockTimeZoneToggleOnBookingPage"] = True
+    for user in mock_api.data["users"]:
+        user["locale"] = "en"
+        user["organizationId"] = 7
+    return mock_api
+
+def test_default_projections_are_typed(typed):
+    assert app.typed_projection("/bookings", app.FieldProjection(None, app.DEFAULT_BOOKING_FIELDS))
+    assert app.typed_projection("/event-types", app.FieldProjection(None, app.DEFAULT_EVENT_TYPE_FIELDS))
+    # Everything below a raw JSON field is kept
+    assert app.typed_projection("/bookings", app.FieldProjection(["metadata.anything"]))
+
+def test_unmodeled_fields_are_not_typed(typed):
+    assert not app.typed_projection("/bookings", app.FieldProjection(["*"]))
+    assert not app.typed_projection("/bookings", app.FieldProjection(["recurringBookingUid"]))
+    assert not app.typed_projection("/bookings", app.FieldProjection(["attendees.phoneNumber"]))
+    assert not app.typed_projection("/users", app.FieldProjection(["id", "locale"]))
+
+def test_full_payload_keeps_unmodeled_fields(typed, extra_fields):
+
+    async def run():
+        return await app.list_users(), await app.list_event_types(fields=["*"]), await app.get_bookings(fields=["*"], limit=50)
+    decoded = app.typed_stats["decoded"]
+    users, event_types, bookings = asyncio.run(run())
+    assert users["data"][0]["locale"] == "en"
+    assert users["data"][0]["organizationId"] == 7
+    assert event_types["data"][0]["lockTimeZoneToggleOnBookingPage"] is True
+    assert any("recurringBookingUid" in booking for booking in bookings["data"])
+    assert app.typed_stats["decoded"] == decoded
+
+def test_projected_results_match_plain_decoding(monkeypatch, extra_fields):
+
+    async def run():
+        plain = await app.list_event_types()
+        monkeypatch.setattr(app, "CALCOM_TYPED_MODELS", True)
+        decoded = app.typed_stats["decoded"]
+        typed = await app.list_event_types()
+        return plain, typed, app.typed_stats["decoded"] - decoded
+    plain, typed, decoded = asyncio.run(run())
+    assert decoded == 1
+    assert typed == plain
+
+def test_mirror_keeps_unmodeled_fields(typed, extra_fields):
+    mirror = app.BookingMirror(":memory:", 60)
+
+    async def run():
+        await mirror.sync()
+        return await mirror.query(status="recurring"), await mirror.query(user_id=999)
+    recurring, user = asyncio.run(run())
+    expected_recurring = [b for b in extra_fields.data["bookings"] if "recurringBookingUid" in b and b["status"] not in ("cancelled", "rejected")]
+    assert len(recurring) == len(expected_recurring) > 0
+    assert len(user) == sum(1 for b in extra_fields.data["bookings"] if b["userId"] == 999) > 0
+
+def test_cache_hits_are_not_converted_again(typed, mock_api, monkeypatch):
+    conversions = []
+    to_plain = app.to_plain
+    monkeypatch.setattr(app, "to_plain", lambda value: conversions.append(value) or to_plain(value))
+
+    async def run():
+        return [await app.list_event_types() for _ in range(3)]
+    first, second, third = asyncio.run(run())
+    assert len(conversions) == 1
+    assert mock_api.requests == 1
+    assert first == second == third
+    assert isinstance(app.response_cache.get(app.ResponseCache.make_key("/event-types", tenant=app.current_tenant()) + "#typed"), dict)
@@ -0,0 +1,92 @@
+import hmac
+import json
+import asyncio
+import hashlib
+
+import pytest
+from starlette.requests import Request
+
+import app
+
+SECRET = "whsec-test"
+KEY = app.ResponseCache.make_key("/bookings", tenant="t")
+BODY = json.dumps({"triggerEvent": "BOOKING_CANCELLED", "payload": {"uid": "abc"}}).encode()
+
+def sign(body, secret=SECRET):
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+@pytest.fixture(autouse=True)
+def secret(monkeypatch):
+    monkeypatch.setattr(app, "CALCOM_WEBHOOK_SECRET", SECRET)
+    monkeypatch.setattr(app, "booking_mirror", None)
+    monkeypatch.setattr(app, "webhook_stats", {"received": 0, "rejected": 0, "triggers": {}})
+
+def post(body, signature=None):
+    headers = [(b"content-type", b"application/json")]
+    if signature is not None:
+        headers.append((b"x-cal-signature-256", signature.encode("latin-1")))
+    scope = {"type": "http", "method": "POST", "path": "/webhooks/calcom", "headers": headers, "query_string": b""}
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    response = asyncio.run(app.calcom_webhook(Request(scope, receive)))
+    return response.status_code, json.loads(response.body)
+
+def test_valid_signature_is_accepted():
+    assert app.verify_webhook_signature(BODY, sign(BODY))
+
+@pytest.mark.parametrize("signature", [
+    lambda: "sha256=" + sign(BODY),
+    lambda: sign(BODY).upper(),
+    lambda: "  " + sign(BODY) + "\n",
+])
+def test_prefix_case_and_whitespace_are_tolerated(signature):
+    assert app.verify_webhook_signature(BODY, signature())
+
+@pytest.mark.parametrize("signature", [
+    lambda: sign(BODY, "other-secret"),
+    lambda: sign(BODY + b" "),
+    lambda: sign(BODY)[:-1],
+    lambda: "",
+    lambda: None,
+    lambda: "é" * 64,
+])
+def test_wrong_signature_is_rejected(signature):
+    assert not app.verify_webhook_signature(BODY, signature())
+
+def test_nothing_verifies_without_a_secret(monkeypatch):
+    monkeypatch.setattr(app, "CALCOM_WEBHOOK_SECRET", None)
+    assert not app.verify_webhook_signature(BODY, sign(BODY, ""))
+
+def test_endpoint_applies_signed_events():
+    app.response_cache.set(KEY, {"data": []}, 12, 300)
+    assert post(BODY, sign(BODY)) == (200, {"status": "success", "triggerEvent": "BOOKING_CANCELLED"})
+    assert app.response_cache.get(KEY) is None
+    assert app.webhook_stats["triggers"] == {"BOOKING_CANCELLED": 1}
+
+def test_endpoint_rejects_bad_signatures():
+    app.response_cache.set(KEY, {"data": []}, 12, 300)
+    assert post(BODY, sign(BODY, "other-secret"))[0] == 401
+    assert post(BODY)[0] == 401
+    assert app.response_cache.get(KEY) is not None
+    assert app.webhook_stats["rejected"] == 2
+    app.response_cache.invalidate("/bookings")
+
+def test_endpoint_is_disabled_without_a_secret(monkeypatch):
+    monkeypatch.setattr(app, "CALCOM_WEBHOOK_SECRET", "")
+    assert post(BODY, sign(BODY, ""))[0] == 503
+
+@pytest.mark.parametrize("event", [
+    {"triggerEvent": "BOOKING_CANCELLED", "payload": "x"},
+    {"triggerEvent": "BOOKING_CANCELLED", "payload": ["abc"]},
+    ["BOOKING_CANCELLED"],
+    "BOOKING_CANCELLED",
+])
+def test_endpoint_rejects_events_that_are_not_objects(monkeypatch, event):
+    monkeypatch.setattr(app, "booking_mirror", app.BookingMirror(":memory:", 60))
+    body = json.dumps(event).encode()
+    status, response = post(body, sign(body))
+    assert status == 400
+    assert response["error"] == "Invalid JSON payload"
+    assert app.webhook_stats["received"] == 0
@@ -0,0 +1,70 @@
+import os
+import re
+import sys
+import time
+import signal
+import socket
+import subprocess
+
+import httpx
+import pytest
+
+from conftest import ROOT
+
+MCP_HEADERS = {"Content-Type": "application/json", "Accept": "application/json, text/event-stream"}
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def rpc(method, params, id=1):
+    return {"jsonrpc": "2.0", "id": id, "method": method, "params": params}
+
+@pytest.fixture
+def server(mock_api, tmp_path):
+    """Start `python app.py` with the given worker count and return its base URL"""
+    processes = []
+
+    def start(workers):
+        port = free_port()
+        env = dict(os.environ, PORT=str(port), CALCOM_WORKERS=str(workers), CALCOM_API_BASE=mock_api.base_url)
+        env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+        process = subprocess.Popen([sys.executable, "app.py"], cwd=ROOT, env=env, stdout=open(tmp_path / "server.log", "w"), stderr=subprocess.STDOUT)
+        processes.append(process)
+        url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            assert process.poll() is None, (tmp_path / "server.log").read_text()
+            try:
+                if httpx.get(f"{url}/metrics").status_code == 200:
+                    return url
+            except httpx.TransportError:
+                time.sleep(0.2)
+        pytest.fail("server did not start: " + (tmp_path / "server.log").read_text())
+
+    yield start
+    for process in processes:
+        process.send_signal(signal.SIGTERM)
+        # uvicorn re-raises SIGTERM once it has shut down gracefully
+        assert process.wait(timeout=15) in (0, -signal.SIGTERM)
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_server_starts_and_answers_mcp(server, workers):
+    url = server(workers)
+    response = httpx.post(f"{url}/mcp", headers=MCP_HEADERS, json=rpc("initialize", {
+        "protocolVersion": "2025-06-18", "capabilities": {}, "clientInfo": {"name": "test", "version": "1"}
+    }))
+    assert response.status_code == 200
+    assert "Cal.com MCP" in response.text
+
+def test_metrics_add_up_across_workers(server):
+    url = server(2)
+    for n in range(8):
+        # A new connection each time, so calls are spread over the workers
+        response = httpx.post(f"{url}/mcp", headers=MCP_HEADERS, json=rpc("tools/call", {"name": "get_api_status", "arguments": {}}, n))
+        assert response.status_code == 200
+    for _ in range(6):
+        text = httpx.get(f"{url}/metrics").text
+        assert re.search(r'calcom_mcp_tool_calls_total\{tool="get_api_status"\} 8\.0', text), text
+        assert re.search(r'calcom_mcp_tool_in_flight\{tool="get_api_status"\} 0\.0', text), text